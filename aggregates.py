@@ -0,0 +1,256 @@
+"""
+Mergeable per-cell aggregates of survey scores.
+
+CellAggregates keeps, for every action x component cell, the count,
+sum, min, max, mean and variance of the scores and a histogram of the
+raw answers. Two aggregates merge into the aggregate of all their
+surveys, in any order, so shards of an archive can be reduced across
+processes or machines without going back to the raw data.
+
+ResultsWriter keeps the aggregates of a results file up to date in
+<name>.agg next to it (see updateSidecar and loadSidecar).
+"""
+import csv
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from survey_core import ACTIONS, questions, WEIGHTS, IMPACT_SCALE, RATING_SCALE
+from results_index import iterRows
+
+CELLS = (len(ACTIONS), len(questions))
+# histogram bins: impact x intensidad x extension = 3 x 5 x 5 = 75
+BINS = len(IMPACT_SCALE) * len(RATING_SCALE) ** 2
+
+MAGIC = b"EISAGG1\0"
+HEADER = struct.Struct("<8sHH")
+SIDECAR_MAGIC = b"EISAGGF1"
+SIDECAR_HEADER = struct.Struct("<8sQ")  # magic, bytes of the results file covered
+
+# raw answer columns of a results row, after the metadata and score
+# columns (see results_writer.HEADER)
+TRIPLET_COLUMNS = slice(4 + CELLS[0] * CELLS[1], 4 + 4 * CELLS[0] * CELLS[1])
+
+# answer code -> position on its scale, -1 for codes that are not on it
+IMPACT_POSITION = np.full(256, -1, dtype=np.int16)
+RATING_POSITION = np.full(256, -1, dtype=np.int16)
+for position, (text, value) in enumerate(IMPACT_SCALE):
+    IMPACT_POSITION[value % 256] = position
+for position, (text, value) in enumerate(RATING_SCALE):
+    RATING_POSITION[value % 256] = position
+
+
+def binIndex(triplets):
+    """
+    Return the histogram bin of each (impact, intensidad, extension)
+    in triplets (..., 3), or -1 where intensidad or extension is unrated.
+    """
+    triplets = np.asarray(triplets, dtype=np.int64) % 256
+    impact = IMPACT_POSITION[triplets[..., 0]]
+    intensidad = RATING_POSITION[triplets[..., 1]]
+    extension = RATING_POSITION[triplets[..., 2]]
+    bins = (impact * len(RATING_SCALE) + intensidad) * len(RATING_SCALE) + extension
+    return np.where((impact < 0) | (intensidad < 0) | (extension < 0), -1, bins)
+
+
+def binTriplets():
+    """
+    Return the (impact, intensidad, extension) of every histogram bin, shape (75, 3).
+    """
+    return np.array([(impact, intensidad, extension)
+                     for text, impact in IMPACT_SCALE
+                     for text, intensidad in RATING_SCALE
+                     for text, extension in RATING_SCALE], dtype=np.int64)
+
+
+class CellAggregates(object):
+    """
+    Class that accumulates score statistics for every cell.
+
+    count, total, low, high: (13, 3) count, sum, min and max of the scores.
+    mean, m2: running mean and sum of squared deviations (for variance).
+    hist: (13, 3, 75) counts of each raw answer, see binIndex.
+    unrated: (13, 3) counts of 'No Impact' answers left without intensidad
+    or extension, which have no histogram bin.
+    """
+
+    def __init__(self):
+        self.count = np.zeros(CELLS, dtype=np.int64)
+        self.total = np.zeros(CELLS, dtype=np.int64)
+        self.low = np.full(CELLS, np.iinfo(np.int16).max, dtype=np.int16)
+        self.high = np.full(CELLS, np.iinfo(np.int16).min, dtype=np.int16)
+        self.mean = np.zeros(CELLS, dtype=np.float64)
+        self.m2 = np.zeros(CELLS, dtype=np.float64)
+        self.hist = np.zeros(CELLS + (BINS,), dtype=np.int64)
+        self.unrated = np.zeros(CELLS, dtype=np.int64)
+
+    def __reduce__(self):
+        return CellAggregates.frombytes, (self.tobytes(),)
+
+    def update(self, triplets, weights=WEIGHTS, scores=None):
+        """
+        Add a chunk of surveys given as raw answers with shape (n, 13, 3, 3).
+        scores may hold their (n, 13, 3) scores under weights if the
+        caller already has them, for example from scoring.rescoreBatch.
+        """
+        triplets = np.asarray(triplets)
+        if len(triplets) == 0:
+            return self
+        if scores is None:
+            # widen first: int8 answers times the weights wrap around in int8
+            wide = triplets.astype(np.int64)
+            scores = wide[..., 0] * (weights[0] * wide[..., 1] + weights[1] * wide[..., 2])
+        scores = np.asarray(scores, dtype=np.int64)
+
+        chunk = CellAggregates()
+        chunk.count[:] = len(scores)
+        chunk.total[:] = scores.sum(axis=0)
+        chunk.low[:] = scores.min(axis=0)
+        chunk.high[:] = scores.max(axis=0)
+        chunk.mean[:] = scores.mean(axis=0)
+        chunk.m2[:] = ((scores - chunk.mean) ** 2).sum(axis=0)
+
+        bins = binIndex(triplets)
+        cells = np.arange(CELLS[0] * CELLS[1]).reshape(CELLS)
+        rated = bins >= 0
+        flat = (cells * BINS + bins)[rated]
+        chunk.hist[:] = np.bincount(flat, minlength=chunk.hist.size).reshape(chunk.hist.shape)
+        chunk.unrated[:] = (~rated).sum(axis=0)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Merge other into this aggregate and return it.
+        """
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(count > 0, other.count / count, 0.0)
+            self.m2 += other.m2 + delta ** 2 * self.count * weight
+        self.mean += delta * weight
+        self.count = count
+        self.total += other.total
+        np.minimum(self.low, other.low, out=self.low)
+        np.maximum(self.high, other.high, out=self.high)
+        self.hist += other.hist
+        self.unrated += other.unrated
+        return self
+
+    def quantile(self, q, weights=WEIGHTS):
+        """
+        Return the (13, 3) q-quantile of the scores for 0 <= q <= 1: the
+        smallest score that at least a fraction q of the cell's answers
+        are at or below, so quantile(0.5) is the median and quantile(0.9)
+        the P90. NaN for empty cells.
+
+        A score depends only on the raw answer, so the histogram is an
+        exact sketch of the score distribution under any weights: the
+        rank error is 0 and each cell keeps 76 counters (75 bins and
+        unrated) however many surveys it holds.
+        """
+        triplets = binTriplets()
+        values = np.append(triplets[:, 0] * (weights[0] * triplets[:, 1] + weights[1] * triplets[:, 2]), 0)
+        counts = np.concatenate([self.hist, self.unrated[..., np.newaxis]], axis=-1)
+        order = np.argsort(values, kind="stable")
+        cumulative = counts[..., order].cumsum(axis=-1)
+        target = np.maximum(np.ceil(q * self.count), 1)
+        position = (cumulative < target[..., np.newaxis]).sum(axis=-1)
+        result = values[order][np.minimum(position, len(values) - 1)].astype(np.float64)
+        result[self.count == 0] = np.nan
+        return result
+
+    def variance(self, ddof=0):
+        """
+        Return the (13, 3) variance of the scores, NaN where there are too few.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def tobytes(self):
+        """
+        Return the aggregate in a compact, compressed form.
+        """
+        arrays = b"".join(array.tobytes() for array in
+                          (self.count, self.total, self.low, self.high, self.mean, self.m2,
+                           self.hist, self.unrated))
+        return HEADER.pack(MAGIC, CELLS[0], CELLS[1]) + zlib.compress(arrays)
+
+    @classmethod
+    def frombytes(cls, data):
+        """
+        Rebuild an aggregate written by tobytes.
+        """
+        magic, actions, components = HEADER.unpack_from(data)
+        if magic != MAGIC or (actions, components) != CELLS:
+            raise ValueError("not an aggregate of {}x{} cells".format(*CELLS))
+        arrays = zlib.decompress(data[HEADER.size:])
+        aggregate = cls()
+        offset = 0
+        for name in ("count", "total", "low", "high", "mean", "m2", "hist", "unrated"):
+            array = getattr(aggregate, name)
+            array[...] = np.frombuffer(arrays, dtype=array.dtype, count=array.size,
+                                       offset=offset).reshape(array.shape)
+            offset += array.nbytes
+        return aggregate
+
+
+def sidecarName(filename):
+    return filename + ".agg"
+
+
+def loadSidecar(filename):
+    """
+    Return (covered, aggregates) from the sidecar of a results file, where
+    covered is how many bytes of the results file it includes.
+    A missing or unreadable sidecar gives (0, CellAggregates()).
+    """
+    try:
+        with open(sidecarName(filename), "rb") as sidecar:
+            data = sidecar.read()
+        magic, covered = SIDECAR_HEADER.unpack_from(data)
+        if magic == SIDECAR_MAGIC:
+            return covered, CellAggregates.frombytes(data[SIDECAR_HEADER.size:])
+    except (OSError, ValueError, struct.error, zlib.error):
+        pass
+    return 0, CellAggregates()
+
+
+def updateSidecar(filename, data_fd, size, new_size, triplet_rows, chunk_size=4096, skipped=None):
+    """
+    Add rows just appended to a results file to its sidecar aggregates.
+    size and new_size are the size of the file before and after the
+    rows, triplet_rows holds the raw answer columns of each row as ints,
+    and data_fd is the results file descriptor locked by
+    results_writer.openLocked. Rows the sidecar does not cover yet are
+    read from the uncovered tail of the file first; any of them that is
+    not a results row is left out, and if skipped is a list its byte
+    offset is appended to it, like results_reader.readChunks does.
+    """
+    covered, aggregates = loadSidecar(filename)
+    if covered > size:
+        covered, aggregates = 0, CellAggregates()  # the results file was replaced
+
+    rows = []
+    for offset, line in iterRows(data_fd, covered, size):
+        row = next(csv.reader([line.decode("utf-8", "replace")]), [])
+        try:
+            if len(row) != TRIPLET_COLUMNS.stop:
+                raise ValueError("expected {} columns".format(TRIPLET_COLUMNS.stop))
+            rows.append([int(value) for value in row[TRIPLET_COLUMNS]])
+        except ValueError:
+            if skipped is not None:
+                skipped.append(offset)
+            continue
+        if len(rows) == chunk_size:
+            aggregates.update(np.reshape(rows, (-1,) + CELLS + (3,)))
+            rows = []
+    rows.extend(triplet_rows)
+    if rows:
+        aggregates.update(np.reshape(rows, (-1,) + CELLS + (3,)))
+
+    temporary = "{}.{}.tmp".format(sidecarName(filename), os.getpid())
+    with open(temporary, "wb") as sidecar:
+        sidecar.write(SIDECAR_HEADER.pack(SIDECAR_MAGIC, new_size) + aggregates.tobytes())
+    os.replace(temporary, sidecarName(filename))
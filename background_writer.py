@@ -0,0 +1,158 @@
+"""
+Background writer for completed surveys.
+
+The survey window hands each completed SessionRecord to a writer
+thread through a bounded queue, so writing the results file, the
+binary log and the optional SQLite database never blocks the Tk event
+loop. Every write is fsynced before it is reported, and the results
+come back on a second queue that the window polls with after(), since
+Tk may only be used from its own thread.
+"""
+import queue
+import threading
+import time
+
+from results_writer import ResultsWriter
+from binary_log import BinaryLogWriter
+from sqlite_store import SQLiteStore
+
+
+class BackgroundWriter(object):
+    """
+    Class that writes completed surveys on a writer thread.
+
+    submit() queues a record with a callback; once the record is on disk,
+    or could not be written, poll() returns (callback, error) with error
+    None on success. Submitting a survey again after an error only
+    writes it to the files that did not get it the first time, and only
+    fsyncs again the files that got it but could not flush it to disk.
+    At most maxsize surveys wait in the queue, submit() raises
+    queue.Full beyond that. stats() returns the queue depth and
+    write latency, and each write is also added to the histograms of a
+    metrics.MetricsRegistry if one is given.
+    """
+
+    def __init__(self, results_file="answers.csv", log_file="answers.bin", database=None, maxsize=16,
+                 metrics=None):
+        self.results_file = results_file
+        self.log_file = log_file
+        self.database = database
+        self.metrics = metrics
+        self.jobs = queue.Queue(maxsize)
+        self.done = queue.Queue()
+        # survey_id -> {sink name: "saved" or "unsynced"} for the sinks that
+        # already hold a survey whose write failed, only used by the writer thread
+        self.saved = {}
+
+        # surveys submitted but not polled yet, and metrics, see stats()
+        self.pending = 0
+        self.written = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+
+        self.thread = threading.Thread(target=self.run, name="survey-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, record, finished, callback):
+        """
+        Queue one completed SessionRecord, finished at time finished.
+        """
+        self.jobs.put_nowait((record, finished, callback, time.perf_counter()))
+        self.pending += 1
+        self.max_depth = max(self.max_depth, self.jobs.qsize())
+
+    def run(self):
+        # the SQLite connection is made here, it may only be used by this thread
+        store = SQLiteStore(self.database, batch_size=1, sync=True) if self.database is not None else None
+        sinks = [("results", ResultsWriter(self.results_file, batch_size=1, sync=True)),
+                 ("log", BinaryLogWriter(self.log_file, batch_size=1, sync=True))]
+        if store is not None:
+            sinks.append(("database", store))
+        try:
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    break
+                record, finished, callback, submitted = job
+                start = time.perf_counter()
+                try:
+                    self.writeSurvey(sinks, record, finished)
+                    error = None
+                except Exception as exception:  # reported to the window, which lets the user retry
+                    error = exception
+                end = time.perf_counter()
+                self.done.put((callback, error, end - submitted, end - start))
+        finally:
+            if store is not None:
+                store.close()
+
+    def writeSurvey(self, sinks, record, finished):
+        """
+        Write record to every sink that does not hold it yet.
+        """
+        saved = self.saved.setdefault(record.survey_id, {})
+        for name, sink in sinks:
+            if saved.get(name) == "saved":
+                continue
+            try:
+                if saved.get(name) == "unsynced":
+                    sink.syncFile()
+                else:
+                    sink.write(record, finished)
+            except Exception:
+                # a survey still buffered never reached the sink, drop it so
+                # a retry does not add a second copy; otherwise it is in
+                # the sink, and either only needs another fsync or only a
+                # later step (such as the index) failed
+                if not sink.discard():
+                    saved[name] = "unsynced" if getattr(sink, "unsynced", False) else "saved"
+                raise
+            saved[name] = "saved"
+        del self.saved[record.survey_id]
+
+    def poll(self):
+        """
+        Return (callback, error) for every survey written since the last poll.
+        """
+        events = []
+        while True:
+            try:
+                callback, error, latency, seconds = self.done.get_nowait()
+            except queue.Empty:
+                return events
+            self.pending -= 1
+            if error is None:
+                self.written += 1
+                self.latency += latency
+                self.max_latency = max(self.max_latency, latency)
+                if self.metrics is not None:
+                    self.metrics.observe("write_seconds", seconds)
+                    self.metrics.observe("write_latency_seconds", latency)
+            else:
+                self.failed += 1
+            events.append((callback, error))
+
+    def close(self, timeout=None):
+        """
+        Wait for the queued surveys to be written and stop the thread.
+        """
+        if self.thread.is_alive():
+            self.jobs.put(None)
+            self.thread.join(timeout)
+
+    def stats(self):
+        """
+        Return the queue depth, surveys written and failed, and the mean
+        and worst time in ms from submit() until a survey was on disk.
+        """
+        return {
+            "queue_depth": self.jobs.qsize(),
+            "max_queue_depth": self.max_depth,
+            "pending": self.pending,
+            "written": self.written,
+            "failed": self.failed,
+            "mean_latency_ms": 1000 * self.latency / self.written if self.written else 0.0,
+            "max_latency_ms": 1000 * self.max_latency,
+        }
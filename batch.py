@@ -0,0 +1,95 @@
+"""
+Batch scoring of many results files in parallel.
+
+Each worker process streams one results file with readChunks, rescores
+it from the raw answers with the same rule as the GUI and returns a
+small partial total holding CellAggregates; the partial totals are
+merged at the end.
+"""
+import functools
+import glob
+import os
+import time
+from multiprocessing import Pool
+
+from survey_core import ACTIONS, questions, WEIGHTS
+from aggregates import CellAggregates
+from results_reader import readChunks
+from scoring import rescoreBatch
+from profiling import profiledCall
+
+
+def scoreFile(filename, chunk_size=4096, weights=WEIGHTS):
+    """
+    Score every survey in one results file.
+    Returns a partial total: {"surveys", "skipped", "mismatches", "cells"}
+    where cells is the CellAggregates of the scores and mismatches counts
+    stored scores that differ from the rule (only checked with the
+    default weights).
+    """
+    partial = {
+        "surveys": 0,
+        "skipped": 0,
+        "mismatches": 0,
+        "cells": CellAggregates(),
+    }
+    skipped = []
+    for stored, triplets in readChunks(filename, chunk_size, skipped):
+        scores = rescoreBatch(triplets, weights)[0]
+        partial["surveys"] += len(scores)
+        partial["cells"].update(triplets, weights, scores)
+        if weights == WEIGHTS:
+            partial["mismatches"] += int((scores != stored).any(axis=(1, 2)).sum())
+    partial["skipped"] = len(skipped)
+    return partial
+
+
+def mergePartials(partials):
+    """
+    Add up partial totals from scoreFile.
+    """
+    total = {
+        "surveys": 0,
+        "skipped": 0,
+        "mismatches": 0,
+        "cells": CellAggregates(),
+    }
+    for partial in partials:
+        for key in ("surveys", "skipped", "mismatches"):
+            total[key] += partial[key]
+        total["cells"].merge(partial["cells"])
+    return total
+
+
+def scoreDirectory(directory, workers=None, pattern="*.csv", chunksize=1, profile=None):
+    """
+    Score all results files matching pattern in directory on a pool of
+    workers (all cores by default), handing out chunksize files at a time.
+    With profile set, each worker writes its cProfile stats to
+    <profile>.<pid> (see profiling.profiledCall).
+    Returns the merged total with "files", "seconds" and "surveys_per_second" added.
+    """
+    filenames = sorted(glob.glob(os.path.join(directory, pattern)))
+    task = scoreFile if profile is None else functools.partial(profiledCall, profile, scoreFile)
+    start = time.perf_counter()
+    with Pool(workers) as pool:
+        total = mergePartials(pool.imap_unordered(task, filenames, chunksize))
+    total["files"] = len(filenames)
+    total["seconds"] = time.perf_counter() - start
+    total["surveys_per_second"] = total["surveys"] / total["seconds"] if total["seconds"] else 0.0
+    return total
+
+
+def printTotal(total):
+    """
+    Print the merged total as a table of per-action and per-component sums.
+    """
+    print("{} files, {} surveys in {:.2f}s ({:.0f} surveys/s), {} rows skipped, {} mismatched".format(
+        total["files"], total["surveys"], total["seconds"], total["surveys_per_second"],
+        total["skipped"], total["mismatches"]))
+    print("{:<22}".format("Action") + "".join("{:>16}".format(q) for q in questions) + "{:>16}".format("Total"))
+    for (action, title), cells in zip(ACTIONS, total["cells"].total.tolist()):
+        print("{:<22}".format(action) + "".join("{:>16}".format(c) for c in cells) + "{:>16}".format(sum(cells)))
+    components = total["cells"].total.sum(axis=0).tolist()
+    print("{:<22}".format("Total") + "".join("{:>16}".format(c) for c in components)
+          + "{:>16}".format(sum(components)))
@@ -0,0 +1,150 @@
+"""
+Append-only binary log of completed surveys.
+
+The file starts with a 16 byte header (magic, version, record size)
+followed by fixed-width records: the SessionRecord bytes (survey id,
+start time, site, scores and raw answers) and the finished time.
+Reading maps the file and views the records as a NumPy structured
+array, without parsing or copying them.
+"""
+import mmap
+import os
+import struct
+import time
+
+from survey_core import SessionRecord
+from results_writer import process_lock, lockFile, unlockFile
+
+MAGIC = b"EISLOG"
+VERSION = 1
+FILE_HEADER = struct.Struct("<6sHHxxxxxx")
+FINISHED = struct.Struct("<d")
+RECORD_SIZE = SessionRecord.SIZE + FINISHED.size
+
+
+class BinaryLogWriter(object):
+    """
+    Class that appends completed surveys to a binary log file.
+    Records are buffered and appended batch_size at a time with one
+    write, call flush() or close() (or use the writer as a context
+    manager) to write the rest. With sync=True every flush is fsynced;
+    if that fails unsynced is set, and syncFile() retries the fsync
+    without writing the records again.
+    """
+
+    def __init__(self, filename, batch_size=64, sync=False):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.sync = sync
+        self.unsynced = False
+        self.buffer = bytearray()
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, record, finished=None):
+        """
+        Buffer one completed SessionRecord, flushing when the batch is full.
+        """
+        if finished is None:
+            finished = time.time()
+        self.buffer += record.buffer
+        self.buffer += FINISHED.pack(finished)
+        self.count += 1
+        if self.count >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Append the buffered records to the file with one write, holding
+        the same locks as ResultsWriter so several writers sharing the
+        file never both write a header or interleave records. A record
+        cut short at the end of the file is dropped first. They are
+        dropped from the buffer as soon as they are written, so a failed
+        fsync does not write them twice.
+        """
+        if not self.count:
+            return
+        with process_lock:
+            fd = os.open(self.filename, os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+            try:
+                lockFile(fd)
+                try:
+                    file_size = os.fstat(fd).st_size
+                    if file_size < FILE_HEADER.size:
+                        size = 0  # new file, or a header cut short
+                    else:
+                        # drop a record cut short by a crash so new ones stay aligned
+                        size = file_size - (file_size - FILE_HEADER.size) % RECORD_SIZE
+                    if size != file_size:
+                        os.ftruncate(fd, size)
+                    data = self.buffer
+                    if size == 0:
+                        data = FILE_HEADER.pack(MAGIC, VERSION, RECORD_SIZE) + data  # new file, write a header
+                    if os.write(fd, data) != len(data):
+                        os.ftruncate(fd, size)  # disk full, do not leave part of a record
+                        raise OSError("short write to {}".format(self.filename))
+                    self.buffer = bytearray()
+                    self.count = 0
+                    if self.sync:
+                        self.unsynced = True
+                        os.fsync(fd)
+                        self.unsynced = False
+                finally:
+                    unlockFile(fd)
+            finally:
+                os.close(fd)
+
+    def syncFile(self):
+        """
+        Flush a file whose fsync failed to disk again, see unsynced.
+        """
+        fd = os.open(self.filename, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.unsynced = False
+
+    def discard(self):
+        """
+        Drop the records not written yet, returning True if there were any.
+        """
+        dropped = self.count > 0
+        self.buffer = bytearray()
+        self.count = 0
+        return dropped
+
+    def close(self):
+        self.flush()
+
+
+def readBinaryLog(filename):
+    """
+    Map a binary log and return its records as a read-only NumPy
+    structured array with the fields of scoring.RECORD_DTYPE plus
+    'finished'. A record cut short by a crash at the end is left out.
+    """
+    # NumPy is only needed to read the log, not to write it
+    import numpy as np
+    from scoring import RECORD_DTYPE
+
+    dtype = np.dtype(RECORD_DTYPE.descr + [("finished", "<f8")])
+    with open(filename, "rb") as logfile:
+        size = os.fstat(logfile.fileno()).st_size
+        if size == 0:
+            return np.empty(0, dtype=dtype)
+        if size < FILE_HEADER.size:
+            raise ValueError("{} is too short for a survey log header".format(filename))
+        data = mmap.mmap(logfile.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, record_size = FILE_HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or record_size != dtype.itemsize:
+        raise ValueError("{} is not a version {} survey log with {} byte records".format(
+            filename, VERSION, dtype.itemsize))
+    count = (size - FILE_HEADER.size) // record_size
+    return np.frombuffer(data, dtype=dtype, count=count, offset=FILE_HEADER.size)
@@ -0,0 +1,96 @@
+"""
+Buffered structured event log.
+
+Events are small dicts written one per line as JSON to a log file.
+They are buffered in memory and written by a flusher thread every
+flush_interval seconds (or once buffer_size are waiting), so logging
+never waits on the disk. An EventLog without a file, or an event below
+its level, costs one comparison.
+"""
+import atexit
+import json
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR, "off": OFF}
+
+
+class EventLog(object):
+    """
+    Class that appends leveled JSON-lines events to filename.
+    With filename None the log is disabled and nothing is recorded.
+    """
+
+    def __init__(self, filename=None, level=INFO, buffer_size=256, flush_interval=1.0):
+        self.filename = filename
+        self.level = level if filename is not None else OFF
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.events = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopped = False
+        self.thread = None
+        if self.level < OFF:
+            self.thread = threading.Thread(target=self.run, name="event-log", daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+
+    def log(self, level, event, **fields):
+        """
+        Record event with fields if level is at or above the log level.
+        """
+        if level < self.level:
+            return
+        record = {"time": time.time(), "level": level, "event": event}
+        record.update(fields)
+        with self.lock:
+            self.events.append(record)
+            full = len(self.events) >= self.buffer_size
+        if full:
+            self.wake.set()
+
+    def debug(self, event, **fields):
+        self.log(DEBUG, event, **fields)
+
+    def info(self, event, **fields):
+        self.log(INFO, event, **fields)
+
+    def warning(self, event, **fields):
+        self.log(WARNING, event, **fields)
+
+    def error(self, event, **fields):
+        self.log(ERROR, event, **fields)
+
+    def run(self):
+        while not self.stopped:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered events to the file.
+        """
+        with self.lock:
+            events, self.events = self.events, []
+        if events:
+            with open(self.filename, "a", encoding="utf-8") as log_file:
+                log_file.write("".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events))
+
+    def close(self):
+        """
+        Stop the flusher thread and write what is left.
+        """
+        if self.thread is not None:
+            self.stopped = True
+            self.wake.set()
+            self.thread.join()
+            self.thread = None
+            self.flush()
@@ -0,0 +1,118 @@
+"""
+Write-ahead journal for the survey in progress.
+
+Every answered question is appended to a small journal file, so a
+survey cut short by a crash or power loss can be resumed where it
+stopped. The file holds a magic string and the SessionRecord header
+(survey id, start time, site), then one fixed 5 byte entry per answer.
+A survey has at most 13x3 answers, so replaying takes constant time.
+"""
+import os
+import struct
+
+from survey_core import ACTIONS, questions, SessionRecord, SurveySession
+
+MAGIC = b"EISJRNL1"
+ENTRY = struct.Struct("<BBbbb")  # action, question, impact, intensidad, extension
+HEADER_SIZE = len(MAGIC) + SessionRecord.HEADER.size
+
+
+class Journal(object):
+    """
+    Class that appends answers of one SessionRecord to a journal file.
+    Entries go to the OS on every append but are only fsynced every
+    sync_every answers (and on close), so one answer does not cost one
+    disk flush. Use resume=True to keep appending to a replayed journal.
+    """
+
+    def __init__(self, filename, record, resume=False, sync_every=3):
+        self.filename = filename
+        self.sync_every = sync_every
+        self.pending = 0
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        self.fd = os.open(filename, flags | (os.O_APPEND if resume else os.O_TRUNC), 0o644)
+        if resume:
+            # drop an entry cut short by the crash so new entries stay aligned
+            size = os.fstat(self.fd).st_size
+            os.ftruncate(self.fd, size - (size - HEADER_SIZE) % ENTRY.size)
+        else:
+            os.write(self.fd, MAGIC + bytes(record.buffer[:SessionRecord.HEADER.size]))
+            os.fsync(self.fd)
+
+    def append(self, action_index, index, impact, intensidad, extension):
+        """
+        Journal the answer to question index of the action at action_index.
+        """
+        os.write(self.fd, ENTRY.pack(action_index, index, int(impact), int(intensidad), int(extension)))
+        self.pending += 1
+        if self.pending >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """
+        Flush the journalled answers to disk.
+        """
+        if self.pending:
+            os.fsync(self.fd)
+            self.pending = 0
+
+    def close(self):
+        if self.fd is not None:
+            self.sync()
+            os.close(self.fd)
+            self.fd = None
+
+    def finish(self):
+        """
+        Close and remove the journal once the survey has been written out.
+        """
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+
+def replayJournal(filename):
+    """
+    Rebuild the survey in progress from a journal file.
+    Returns (record, action_index, index) where action_index and index
+    point to the next unanswered question (action_index is len(ACTIONS)
+    once every question was answered), or None if there is nothing to
+    resume: no journal, or one holding no answer yet, as written by a
+    Survey closed on the StartPage.
+
+    Entries are replayed through SurveySession.answer, so each one must
+    answer exactly the next question with codes on the scales. Replay
+    stops at the first one that does not (an entry cut short, or the
+    zero-filled tail left by a power loss), and the journal is truncated
+    there so new entries follow the last good one.
+    """
+    try:
+        with open(filename, "rb") as journal_file:
+            data = journal_file.read(HEADER_SIZE + ENTRY.size * len(ACTIONS) * len(questions))
+    except FileNotFoundError:
+        return None
+    if len(data) < HEADER_SIZE + ENTRY.size or not data.startswith(MAGIC):
+        return None
+
+    buffer = bytearray(SessionRecord.SIZE)
+    buffer[:SessionRecord.HEADER.size] = data[len(MAGIC):HEADER_SIZE]
+    record = SessionRecord(buffer)
+
+    session = SurveySession(record)
+    count = (len(data) - HEADER_SIZE) // ENTRY.size
+    replayed = 0
+    for action, question, impact, intensidad, extension in ENTRY.iter_unpack(
+            data[HEADER_SIZE:HEADER_SIZE + count * ENTRY.size]):
+        if (action, question) != (session.action_index, session.index):
+            break
+        if session.answer(impact, intensidad, extension) is not None:
+            break
+        replayed += 1
+
+    if HEADER_SIZE + replayed * ENTRY.size < os.path.getsize(filename):
+        os.truncate(filename, HEADER_SIZE + replayed * ENTRY.size)
+    if replayed == 0:
+        return None
+    return record, session.action_index, session.index
@@ -6,109 +6,184 @@ Date: 2019.11.17
 
 Trying to make a survey that can do environmental impoct surveys
 """
-import csv
-import os.path
+import argparse
+import asyncio
+import atexit
+import os
+import queue
+import sys
 import time
 from tkinter import (Tk, Label, Button, Frame, Menu,
                      StringVar, Toplevel, Entry)
 from tkinter import messagebox
 from tkinter import ttk
 
-# create empty lists used for each set of questions
-actions_impacts = dict()
-questions = ["Abiotico", "Biotico", "Socioeconomico"]
+from background_writer import BackgroundWriter
+from event_log import EventLog, INFO, LEVELS
+from metrics import MetricsRegistry
+from profiling import profiled, frameSnapshot, recordFrame
+from journal import Journal, replayJournal
+from survey_core import questions, ACTIONS, IMPACT_SCALE, RATING_SCALE, SurveySession
 
-
-def dialogBox(title, message):
-    """
-    Basic function to create and display general dialog boxes.
-    """
-    dialog = Tk()
-    dialog.wm_title(title)
-    dialog.grab_set()
-    dialogWidth, dialogHeight = 225, 125
-    positionRight = int(dialog.winfo_screenwidth() / 2 - dialogWidth / 2)
-    positionDown = int(dialog.winfo_screenheight() / 2 - dialogHeight / 2)
-    dialog.geometry("{}x{}+{}+{}".format(
-        dialogWidth, dialogHeight, positionRight, positionDown))
-    dialog.maxsize(dialogWidth, dialogHeight)
-    label = Label(dialog, text=message)
-    label.pack(side="top", fill="x", pady=10)
-    ok_button = ttk.Button(dialog, text="Ok", command=dialog.destroy)
-    ok_button.pack(ipady=3, pady=10)
-    dialog.mainloop()
-
-
-def nextSurveyDialog(title, message, cmd):
-    """
-    Dialog box that appears before moving onto the next set of questions.
-    """
-    dialog = Tk()
-    dialog.wm_title(title)
-    dialog.grab_set()
-    dialogWidth, dialogHeight = 225, 125
-    positionRight = int(dialog.winfo_screenwidth() / 2 - dialogWidth / 2)
-    positionDown = int(dialog.winfo_screenheight() / 2 - dialogHeight / 2)
-    dialog.geometry("{}x{}+{}+{}".format(
-        dialogWidth, dialogHeight, positionRight, positionDown))
-    dialog.maxsize(dialogWidth, dialogHeight)
-    dialog.overrideredirect(True)
-    label = Label(dialog, text=message)
-    label.pack(side="top", fill="x", pady=10)
-    ok_button = ttk.Button(dialog, text="Begin", command=lambda: [f() for f in [cmd, dialog.destroy]])
-    ok_button.pack(ipady=3, pady=10)
-
-    dialog.protocol("WM_DELETE_WINDOW", disable_event)  # prevent user from clicking ALT + F4 to close
-    dialog.mainloop()
+# longest a kiosk reset may take to get back to the StartPage, in seconds
+RESET_BUDGET = 0.05
 
 
 def disable_event():
     pass
 
 
-def finishedDialog(title, message):
-    """
-    Display the finished dialog box when user reaches the end of the survey.
+class DialogPool(object):
     """
-    dialog = Tk()
-    dialog.wm_title(title)
-    dialog.grab_set()
-    dialogWidth, dialogHeight = 325, 150
-    positionRight = int(dialog.winfo_screenwidth() / 2 - dialogWidth / 2)
-    positionDown = int(dialog.winfo_screenheight() / 2 - dialogHeight / 2)
-    dialog.geometry("{}x{}+{}+{}".format(
-        dialogWidth, dialogHeight, positionRight, positionDown))
-    dialog.maxsize(dialogWidth, dialogHeight)
-    dialog.overrideredirect(True)
-    label = Label(dialog, text=message)
-    label.pack(side="top", fill="x", pady=10)
-    ok_button = ttk.Button(dialog, text="Quit", command=quit)
-    ok_button.pack(ipady=3, pady=10)
-
-    dialog.protocol("WM_DELETE_WINDOW", disable_event)  # prevent user from clicking ALT + F4 to close
-    dialog.mainloop()
-
-
-def writeToFile(filename, answer_list):
+    Class that shows the general, next survey and finished dialog boxes.
+    One Toplevel per kind of dialog is created on first use, owned by
+    the main window, and then reused for every later popup instead of
+    starting a new Tk() interpreter each time.
     """
-    Called at end of program when user selects finished button,
-    write all lists to separate files.
-    Parameters: filename: name for save file,
-                answer_list: list containing answer from that one of the
-                four sections in the survey.
-    """
-    headers = []
-    file_exists = os.path.isfile(filename)
 
-    with open(filename, 'a') as csvfile:
-        for i in range(1, len(answer_list) + 1):
-            headers.append("Q{}".format(i))
-        writer = csv.writer(csvfile, delimiter=',', lineterminator='\n')
+    def __init__(self, master):
+        self.master = master
+        self.windows = {}
+
+        # popup count and total time to map a dialog, see stats()
+        self.popups = 0
+        self.latency = 0.0
+
+    def dialogBox(self, title, message):
+        """
+        Display a general dialog box.
+        """
+        self.show("general", 225, 125, True, title, message, "Ok", None)
+
+    def nextSurveyDialog(self, title, message, cmd):
+        """
+        Dialog box that appears before moving onto the next set of questions.
+        """
+        self.show("next", 225, 125, False, title, message, "Begin", cmd)
+
+    def finishedDialog(self, title, message, button_text="Quit", cmd=quit):
+        """
+        Display the finished dialog box when user reaches the end of the survey.
+        """
+        self.show("finished", 325, 150, False, title, message, button_text, cmd)
+
+    def getDialog(self, kind, dialogWidth, dialogHeight, closable):
+        """
+        Return the (dialog, label, button) for kind, creating them once.
+        """
+        if kind not in self.windows:
+            dialog = Toplevel(self.master)
+            dialog.withdraw()
+            dialog.transient(self.master)
+            dialog.maxsize(dialogWidth, dialogHeight)
+            if closable:
+                dialog.protocol("WM_DELETE_WINDOW", lambda: self.close(dialog, None))
+            else:
+                dialog.overrideredirect(True)
+                dialog.protocol("WM_DELETE_WINDOW", disable_event)  # prevent user from clicking ALT + F4 to close
+            label = Label(dialog)
+            label.pack(side="top", fill="x", pady=10)
+            ok_button = ttk.Button(dialog)
+            ok_button.pack(ipady=3, pady=10)
+            self.windows[kind] = (dialog, label, ok_button)
+        return self.windows[kind]
+
+    def show(self, kind, dialogWidth, dialogHeight, closable, title, message, button_text, cmd):
+        """
+        Centre the dialog for kind on screen, fill it in and make it modal.
+        cmd is called after the dialog is closed with its button.
+        """
+        start = time.perf_counter()
+        dialog, label, ok_button = self.getDialog(kind, dialogWidth, dialogHeight, closable)
+        dialog.wm_title(title)
+        label.config(text=message)
+        ok_button.config(text=button_text, command=lambda: self.close(dialog, cmd))
+
+        positionRight = int(dialog.winfo_screenwidth() / 2 - dialogWidth / 2)
+        positionDown = int(dialog.winfo_screenheight() / 2 - dialogHeight / 2)
+        dialog.geometry("{}x{}+{}+{}".format(
+            dialogWidth, dialogHeight, positionRight, positionDown))
+        dialog.deiconify()
+        dialog.lift()
+        dialog.grab_set()
+        dialog.update_idletasks()
+
+        seconds = time.perf_counter() - start
+        self.popups += 1
+        self.latency += seconds
+        self.master.metrics.observe("dialog_seconds", seconds, kind=kind)
 
-        if not file_exists:
-            writer.writerow(headers)  # file doesn't exist yet, write a header
+    def close(self, dialog, cmd):
+        """
+        Hide the dialog so it can be reused, then run cmd.
+        """
+        dialog.grab_release()
+        dialog.withdraw()
+        if cmd is not None:
+            cmd()
 
-        writer.writerow(answer_list)
+    def stats(self):
+        """
+        Return the popup count, mean popup latency in ms and the number
+        of dialog windows created.
+        """
+        return {
+            "popups": self.popups,
+            "mean_latency_ms": 1000 * self.latency / self.popups if self.popups else 0.0,
+            "windows": len(self.windows),
+        }
+
+
+def benchmarkDialogs(count=100):
+    """
+    Open and close count dialog boxes on a Survey window and print the
+    DialogPool stats with the number of Tk interpreters created meanwhile.
+    """
+    created = []
+    tk_init = Tk.__init__
+
+    def countingInit(self, *args, **kwargs):
+        created.append(self)
+        tk_init(self, *args, **kwargs)
+
+    Tk.__init__ = countingInit
+    try:
+        # its own journal, so a survey in progress is not touched
+        app = Survey(journal="benchmark.journal")
+        for i in range(count):
+            app.dialogs.dialogBox("Benchmark", "Dialog {}".format(i + 1))
+            app.dialogs.close(app.dialogs.windows["general"][0], None)
+    finally:
+        Tk.__init__ = tk_init
+    stats = app.dialogs.stats()
+    stats["interpreters"] = len(created)
+    print(stats)
+    app.journal.finish()
+    app.destroy()
+
+
+def benchmarkReset(count=100, budget=RESET_BUDGET):
+    """
+    Answer and reset count surveys on a kiosk Survey window, print the
+    mean and worst reset time, and return whether every reset (including
+    redrawing the window) stayed within budget seconds.
+    """
+    app = Survey(transition_delay=0, kiosk=True, journal="benchmark.journal")
+    frame = app.get_frame(ActionFrame)
+    reset_times = []
+    for i in range(count):
+        while not app.session.finished:
+            app.session.answer(1, 1, 1)
+        start = time.perf_counter()
+        app.resetSession()
+        frame.update_idletasks()
+        reset_times.append(time.perf_counter() - start)
+    worst = max(reset_times)
+    print("{} resets: mean {:.2f} ms, worst {:.2f} ms (budget {:.0f} ms), {} live widgets".format(
+        count, 1000 * sum(reset_times) / count, 1000 * worst, 1000 * budget, app.count_widgets()))
+    app.journal.finish()
+    app.destroy()
+    return worst <= budget
 
 
 class otherPopUpDialog(object):
@@ -150,9 +225,27 @@ class Survey(Tk):
     Main class, define the container which will contain all the frames.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, transition_delay=200, database=None, journal='survey.journal', kiosk=False,
+                 event_log=None, log_level=INFO, metrics_file=None, **kwargs):
+        start = time.perf_counter()
+        # latency histograms of every stage, written to metrics_file at exit
+        self.metrics = MetricsRegistry()
+        if metrics_file is not None:
+            atexit.register(self.metrics.dump, metrics_file)
         Tk.__init__(self, *args, **kwargs)
 
+        # delay in ms before the next question is shown, 0 to turn it off
+        self.transition_delay = transition_delay
+        # optional SQLite database that also receives completed surveys
+        self.database = database
+        # in kiosk mode every frame is kept and a finished survey is
+        # followed by a new one in place instead of quitting
+        self.kiosk = kiosk
+        self.journal_file = journal
+        self.reset_times = []
+        # JSON-lines log of answers and sections, disabled without a file
+        self.events = EventLog(event_log, log_level)
+
         # call closing protocol to create dialog box to ask 
         # if user if they want to quit or not.
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -175,16 +268,35 @@ class Survey(Tk):
 
         Tk.config(self, menu=menubar)
 
-        # create empty dictionary for the different frames (the different classes)
-        self.frames = {}
+        # dialog boxes reuse Toplevel windows owned by this window
+        self.dialogs = DialogPool(self)
 
-        for fr in (StartPage, Construccion, Apertura, Adecuacion, Descapote, Vias_transporte, Disposicion, Arranque,
-                   Cargue, Ventilacion, Drenajes, Esteriles_escombros, Cierre, Levantamiento, EndScreen):
-            frame = fr(container, self)
-            self.frames[fr] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        # completed surveys are written on a background thread, see pollWriter
+        self.writer = BackgroundWriter('answers.csv', 'answers.bin', database, metrics=self.metrics)
+        self.writer_poll_interval = 50
 
-        self.show_frame(StartPage)
+        # Frames are built lazily the first time they are shown, so only
+        # the StartPage exists before the window appears.
+        self.container = container
+        self.frames = {}
+        self.frame_order = (StartPage, ActionFrame, EndScreen)
+
+        # the answers of this window's survey, passed to the frames through
+        # the controller; resume a survey left unfinished by a crash,
+        # otherwise journal a new one
+        resumed = replayJournal(journal)
+        if resumed is None:
+            self.session = SurveySession()
+            self.journal = Journal(journal, self.session.record)
+            self.show_frame(StartPage)
+        else:
+            self.session = SurveySession(*resumed)
+            self.journal = Journal(journal, self.session.record, resume=True)
+            self.show_frame(EndScreen if self.session.finished else ActionFrame)
+
+        self.startup_time = time.perf_counter() - start
+        self.metrics.observe("startup_seconds", self.startup_time)
+        print("Startup: {:.3f}s, {} live widgets".format(self.startup_time, self.count_widgets()))
 
     def on_closing(self):
         """
@@ -193,13 +305,103 @@ class Survey(Tk):
         if messagebox.askokcancel("Quit", "Do you want to quit?"):
             self.destroy()
 
+    def destroy(self):
+        """
+        Flush the journal and wait for surveys still being written
+        before closing the window.
+        """
+        self.journal.close()
+        self.writer.close()
+        print("Writer: {}".format(self.writer.stats()))
+        self.events.close()
+        Tk.destroy(self)
+
+    def saveSession(self, callback):
+        """
+        Hand the finished survey to the background writer. callback(error)
+        is called on the Tk thread once it is on disk (error is None) or
+        could not be written.
+        """
+        try:
+            self.writer.submit(self.session.record, time.time(), callback)
+        except queue.Full as error:
+            callback(error)
+            return
+        if self.writer.pending == 1:
+            self.after(self.writer_poll_interval, self.pollWriter)
+
+    def pollWriter(self):
+        """
+        Run the callbacks of written surveys, polling again while any are pending.
+        """
+        for callback, error in self.writer.poll():
+            callback(error)
+        if self.writer.pending:
+            self.after(self.writer_poll_interval, self.pollWriter)
+
+    def resetSession(self):
+        """
+        Start a new survey for the next respondent without rebuilding
+        any widgets, and go back to the StartPage.
+        """
+        start = time.perf_counter()
+        self.session = SurveySession()
+        self.journal.finish()
+        self.journal = Journal(self.journal_file, self.session.record)
+        if ActionFrame in self.frames:
+            self.frames[ActionFrame].showQuestion()
+        self.show_frame(StartPage)
+        seconds = time.perf_counter() - start
+        self.reset_times.append(seconds)
+        if seconds > RESET_BUDGET:
+            self.events.warning("slow_reset", seconds=seconds, budget=RESET_BUDGET)
+
+    def get_frame(self, cont):
+        """
+        Return the frame for class cont, building it on first use.
+        """
+        frame = self.frames.get(cont)
+        if frame is None:
+            before = frameSnapshot()  # None unless profiling
+            with self.metrics.time("frame_build_seconds", frame=cont.__name__):
+                frame = cont(self.container, self)
+                frame.grid(row=0, column=0, sticky="nsew")
+                frame.lower()  # keep prebuilt frames below the one being shown
+            recordFrame(cont.__name__, before)
+            self.frames[cont] = frame
+        return frame
+
     def show_frame(self, cont):
         """
         Used to display a frame.
+        Frames before cont in the survey are finished and get dropped
+        (unless in kiosk mode, where they are reused for the next
+        respondent), and the next frame is built ahead of time once the
+        UI is idle.
         """
-        frame = self.frames[cont]
+        start = time.perf_counter()
+        frame = self.get_frame(cont)
         frame.tkraise()  # bring a frame to the "top"
 
+        position = self.frame_order.index(cont)
+        if not self.kiosk:
+            for finished in self.frame_order[:position]:
+                old_frame = self.frames.pop(finished, None)
+                if old_frame is not None:
+                    old_frame.destroy()
+        self.metrics.observe("show_frame_seconds", time.perf_counter() - start, frame=cont.__name__)
+
+        if position + 1 < len(self.frame_order):
+            self.after_idle(self.get_frame, self.frame_order[position + 1])
+
+    def count_widgets(self, widget=None):
+        """
+        Count the live widgets below widget (the whole window by default).
+        """
+        if widget is None:
+            widget = self
+        return sum(1 + self.count_widgets(child) for child in widget.winfo_children())
+
 
 class StartPage(Frame):
     """
@@ -234,7 +436,7 @@ class StartPage(Frame):
         purpose_text.pack(pady=10, padx=10, ipadx=5, ipady=3)
 
         start_button = ttk.Button(self, text="Begin Survey",
-                                  command=lambda: controller.show_frame(Construccion))
+                                  command=lambda: controller.show_frame(ActionFrame))
         start_button.pack(ipadx=10, ipady=15, pady=15)
 
         quit_button = ttk.Button(self, text="Quit", command=self.on_closing)
@@ -248,233 +450,54 @@ class StartPage(Frame):
             self.controller.destroy()
 
 
-class Construccion(Frame):
+class ActionFrame(Frame):
     """
-    Class that displays questions for Fase 1
-    Construccion campamento y oficinas
+    Class that displays the questions for every action in ACTIONS.
+    One set of widgets is built once and reconfigured in place
+    when the user moves on to the next action.
     """
-    construccion = dict()
+
     def __init__(self, master, controller):
         Frame.__init__(self, master)
         self.controller = controller
 
-        global actions_impacts
-        global questions
         # Create header label
-        ttk.Label(self, text="Construccion campamento y oficinas", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
+        self.header_label = ttk.Label(self, font=('Verdana', 20),
+                                      borderwidth=2, relief="ridge")
+        self.header_label.pack(padx=10, pady=10)
 
         self.questions = questions
 
-        # set index in questions list 
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes 
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text 
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
         # Set up labels and checkboxes
+        self.question_label = Label(self, font=('Verdana', 16))
         self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
 
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
+        self.impact = self.buildScale("Impact", IMPACT_SCALE)
+        self.intensidad = self.buildScale("Intensidad", RATING_SCALE)
+        self.extension = self.buildScale("Extension", RATING_SCALE)
 
         # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.construccion[variable] = total_impact
-            actions_impacts[Construccion] = self.construccion
-            print(self.construccion)
-            print(actions_impacts)
-            next_survey_text = "End of Part 1."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Apertura))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.construccion[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Apertura(Frame):
-    """
-    Class that displays questions for Fase 1
-    Apertura Bocaminas
-    """
-    apertura = dict()
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Apertura y perforación bocaminas", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
+        self.enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
+        self.enter_button.pack(ipady=5, pady=20)
 
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
+        self.showQuestion()
 
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
+    def buildScale(self, name, scale):
+        """
+        Create the label, scale text and radiobuttons for one answer
+        from a list of (text, value), and return the StringVar holding
+        the selected value.
+        """
+        Label(self, text=name, font=('Verdana', 10)).pack(padx=50)
 
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
+        variable = StringVar()
+        variable.set(0)  # initialize
 
         # Frame to contain text
         checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
         checkbox_scale_frame.pack(pady=2)
 
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
         for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
             b = ttk.Label(checkbox_scale_frame, text=text)
             b.pack(side='left', ipadx=7, ipady=5)
 
@@ -483,1877 +506,223 @@ class Apertura(Frame):
         checkbox_frame.pack(pady=10, anchor='center')
 
         for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
+            b = ttk.Radiobutton(checkbox_frame, text=str(value),
+                                variable=variable, value=value)
             b.pack(side='left', ipadx=17, ipady=2)
 
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
+        return variable
 
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
+    def showQuestion(self):
+        """
+        Update the widgets for the current action and question of the
+        controller's session, and clear the previous answer.
+        """
+        start = time.perf_counter()
+        session = self.controller.session
+        self.header_label.config(text=ACTIONS[session.action_index][1])
+        self.question_label.config(text="{}. {}".format(session.index + 1, self.questions[session.index]))
 
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
+        self.impact.set(0)
+        self.extension.set(0)  # reset value for next question
+        self.intensidad.set(0)  # reset value for next question
+        self.enter_button.state(['!disabled'])
+        self.controller.metrics.observe("next_question_seconds", time.perf_counter() - start, stage="reset")
 
     def nextQuestion(self):
         '''
         When button is clicked, add user's input to a list
         and display next question.
         '''
+        metrics = self.controller.metrics
+        start = time.perf_counter()
         answer0 = self.impact.get()
         answer1 = self.intensidad.get()
         answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.apertura[variable] = total_impact
-            actions_impacts[Apertura] = self.apertura
-            print(self.apertura)
-            print(actions_impacts)
-            next_survey_text = "End of Part 2."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Adecuacion))
+        session = self.controller.session
+        action_index, index = session.action_index, session.index
+        error = session.answer(answer0, answer1, answer2)
+        answered = time.perf_counter()
+        metrics.observe("next_question_seconds", answered - start, stage="validate_score")
+        if error is not None:
+            self.controller.dialogs.dialogBox(*error)
         else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.apertura[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
+            self.controller.journal.append(action_index, index, answer0, answer1, answer2)
+            events = self.controller.events
+            events.info("answer", survey=session.record.survey_id, action=ACTIONS[action_index][0],
+                        component=self.questions[index], impact=int(answer0), intensidad=int(answer1),
+                        extension=int(answer2), score=session.record.scores[action_index, index])
+            metrics.observe("next_question_seconds", time.perf_counter() - answered, stage="record")
+
+            if session.action_index != action_index:
+                scores = session.record.actionScores(action_index)
+                events.info("section", survey=session.record.survey_id, action=ACTIONS[action_index][0],
+                            scores=scores, total=sum(scores))
+                next_survey_text = "End of Part {}.".format(action_index + 1)
+                self.controller.dialogs.nextSurveyDialog("Next Survey", next_survey_text, self.nextAction)
+            else:
+                # delay between questions without blocking the event loop,
+                # the button stays disabled so the answer is not sent twice
+                delay = self.controller.transition_delay
+                if delay:
+                    self.enter_button.state(['disabled'])
+                    self.after(delay, self.showQuestion)
+                else:
+                    self.showQuestion()
+        metrics.observe("next_question_seconds", time.perf_counter() - start, stage="total")
+
+    def nextAction(self):
+        """
+        Reuse the frame for the next action, or move on to the
+        EndScreen after the last one.
+        """
+        if self.controller.session.finished:
+            self.controller.show_frame(EndScreen)
+        else:
+            self.showQuestion()
 
 
-class Adecuacion(Frame):
+class EndScreen(Frame):
     """
-    Class that displays questions for Fase 1
-    Adecuacion del sistema de acceso y sostenimiento
+    Displays expenses at game question from General questions.
     """
-    adecuacion = dict()
+
     def __init__(self, master, controller):
         Frame.__init__(self, master)
         self.controller = controller
 
-        global actions_impacts
-        global questions
+        global general_answers_list
+
         # Create header label
-        ttk.Label(self, text="Adecuacion del sistema de acceso y sostenimiento", font=('Verdana', 20),
+        ttk.Label(self, text="End Screen", font=('Verdana', 20),
                   borderwidth=2, relief="ridge").pack(padx=10, pady=10)
 
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
+        self.question = "The evaluation is now finished. Click continue to write the file."
 
-        # Set up labels and checkboxes
+        # Set up labels and listbox
+        self.question_label = Label(self, text="10. {}".format(self.question), font=('Verdana', 16))
         self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
 
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
 
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
+        self.enter_button = ttk.Button(self, text="Continue", command=self.nextQuestion)
+        self.enter_button.pack(ipady=5, pady=20)
 
     def nextQuestion(self):
         '''
-        When button is clicked, add user's input to a list
-        and display next question.
+        end diologue
         '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.adecuacion[variable] = total_impact
-            actions_impacts[Adecuacion] = self.adecuacion
-            print(self.adecuacion)
-            print(actions_impacts)
-            next_survey_text = "End of Part 3."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Descapote))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.adecuacion[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Descapote(Frame):
-    """
-    Class that displays questions for Fase 1
-    Descapote y remotion capa vegetal
-    """
-    descapote = dict()
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Descapote y remotion capa vegetal", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.descapote[variable] = total_impact
-            actions_impacts[Descapote] = self.descapote
-            print(self.descapote)
-            print(actions_impacts)
-            next_survey_text = "End of Part 4."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Vias_transporte))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.descapote[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Vias_transporte(Frame):
-    """
-    Class that displays questions for Fase 1
-    Adecuacion de vias de transporte
-    """
-    vias_transporte = dict()
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Adecuacion de vias de transporte", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.vias_transporte[variable] = total_impact
-            actions_impacts[Vias_transporte] = self.vias_transporte
-            print(self.vias_transporte)
-            print(actions_impacts)
-            next_survey_text = "End of Part 5."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Disposicion))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.vias_transporte[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Disposicion(Frame):
-    """
-    Class that displays questions for Fase 1
-    Disposicion escombros y material removido
-    """
-    disposicion = dict()
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Disposicion escombros y material removido", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.disposicion[variable] = total_impact
-            actions_impacts[Disposicion] = self.disposicion
-            print(self.disposicion)
-            print(actions_impacts)
-            next_survey_text = "End of Part 6."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Arranque))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.disposicion[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Arranque(Frame):
-    """
-    Class that displays questions for Fase 1
-    Arranque y extracción
-    """
-    arranque = dict()
-
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Arranque y extracción", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3 * (int(self.intensidad.get())) + 2 * (int(self.extension.get()))
-            total_impact = int(self.impact.get()) * total_impact
-            variable = self.index + 1
-            self.arranque[variable] = total_impact
-            actions_impacts[Arranque] = self.arranque
-            print(self.arranque)
-            print(actions_impacts)
-            next_survey_text = "End of Part 7."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Cargue))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3 * (int(self.intensidad.get())) + 2 * (int(self.extension.get()))
-            total_impact = int(self.impact.get()) * total_impact
-            variable = self.index
-            self.arranque[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Cargue(Frame):
-    """
-    Class that displays questions for Fase 1
-    Cargue y transporte
-    """
-    cargue = dict()
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Cargue y transporte", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.cargue[variable] = total_impact
-            actions_impacts[Cargue] = self.cargue
-            print(self.cargue)
-            print(actions_impacts)
-            next_survey_text = "End of Part 8."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Ventilacion))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.cargue[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Ventilacion(Frame):
-    """
-    Class that displays questions for Fase 1
-    Ventilacion
-    """
-    ventilacion = dict()
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Ventilacion ", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.ventilacion[variable] = total_impact
-            actions_impacts[Ventilacion] = self.ventilacion
-            print(self.ventilacion)
-            print(actions_impacts)
-            next_survey_text = "End of Part 9."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Drenajes))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.ventilacion[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Drenajes(Frame):
-    """
-    Class that displays questions for Fase 1
-    Drenajes y manejo de aguas
-    """
-    drenajes = dict()
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Drenajes y manejo de aguas", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.drenajes[variable] = total_impact
-            actions_impacts[Drenajes] = self.drenajes
-            print(self.drenajes)
-            print(actions_impacts)
-            next_survey_text = "End of Part 10."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Esteriles_escombros))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.drenajes[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Esteriles_escombros(Frame):
-    """
-    Class that displays questions for Fase 1
-    Disposicion de estériles y escombros
-    """
-    esteriles_escombros = dict()
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Disposicion de estériles y escombros", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.esteriles_escombros[variable] = total_impact
-            actions_impacts[Esteriles_escombros] = self.esteriles_escombros
-            print(self.esteriles_escombros)
-            print(actions_impacts)
-            next_survey_text = "End of Part 11."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Cierre))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.esteriles_escombros[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Cierre(Frame):
-    """
-    Class that displays questions for Fase 1
-    Cierre de bocaminas
-    """
-    cierre = dict()
-
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Cierre de bocaminas", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3 * (int(self.intensidad.get())) + 2 * (int(self.extension.get()))
-            total_impact = int(self.impact.get()) * total_impact
-            variable = self.index + 1
-            self.cierre[variable] = total_impact
-            actions_impacts[Cierre] = self.cierre
-            print(self.cierre)
-            print(actions_impacts)
-            next_survey_text = "End of Part 12."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(Levantamiento))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3 * (int(self.intensidad.get())) + 2 * (int(self.extension.get()))
-            total_impact = int(self.impact.get()) * total_impact
-            variable = self.index
-            self.cierre[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class Levantamiento(Frame):
-    """
-    Class that displays questions for Fase 1
-    Levantamiento infraestructura
-    """
-    levantamiento = dict()
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global actions_impacts
-        global questions
-        # Create header label
-        ttk.Label(self, text="Levantamiento infraestructura", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.questions = questions
-
-        # set index in questions list
-        self.index = 0
-        self.length_of_list = len(self.questions)
-
-        # Set up labels and checkboxes
-        self.question_label = Label(self, text="{}. {}".format(self.index + 1, self.questions[self.index]),
-                                    font=('Verdana', 16))
-        self.question_label.pack(padx=20, pady=10)
-
-        Label(self, text="Impact", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Negative", "No Impact", "Positive"]
-
-        scale = [("-1", -1), ("0", 0), ("1", 1)]
-
-        self.impact = StringVar()
-        self.impact.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.impact, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        Label(self, text="Intensidad", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.intensidad = StringVar()
-        self.intensidad.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.intensidad, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Set up labels and checkboxes
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-        Label(self, text="Extension", font=('Verdana', 10)).pack(padx=50)
-
-        # Not at all, somewhat, average, agree, strongly agree
-        scale_text = ["Baja", "Media", "Alta", "Muy Alta", "Total"]
-
-        scale = [("1", 1), ("2", 2), ("4", 4), ("8", 8), ("12", 12)]
-
-        self.extension = StringVar()
-        self.extension.set(0)  # initialize
-
-        # Frame to contain text
-        checkbox_scale_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_scale_frame.pack(pady=2)
-
-        for text in scale_text:
-            b = ttk.Label(checkbox_scale_frame, text=text)
-            b.pack(side='left', ipadx=7, ipady=5)
-
-        # Frame to contain checkboxes
-        checkbox_frame = Frame(self, borderwidth=2, relief="ridge")
-        checkbox_frame.pack(pady=10, anchor='center')
-
-        for text, value in scale:
-            b = ttk.Radiobutton(checkbox_frame, text=text,
-                                variable=self.extension, value=value)
-            b.pack(side='left', ipadx=17, ipady=2)
-
-        # Create next question button
-        enter_button = ttk.Button(self, text="Next Question", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        When button is clicked, add user's input to a list
-        and display next question.
-        '''
-        answer0 = self.impact.get()
-        answer1 = self.intensidad.get()
-        answer2 = self.extension.get()
-        if answer0 != '0' and answer1 == '0':
-            dialogBox("No Value Given: Intensidad",
-                      "You did not select an answer.\nPlease try again.")
-        elif answer0 != '0' and answer2 == '0':
-            dialogBox("No Value Given: Extension",
-                      "You did not select an answer.\nPlease try again.")
-        elif self.index == (self.length_of_list - 1):
-            # get the last answer from user
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index + 1
-            self.levantamiento[variable] = total_impact
-            actions_impacts[Levantamiento] = self.levantamiento
-            print(self.levantamiento)
-            print(actions_impacts)
-            next_survey_text = "End of Part 13."
-            nextSurveyDialog("Next Survey", next_survey_text,
-                             lambda: self.controller.show_frame(EndScreen))
-        else:
-            self.index = (self.index + 1) % self.length_of_list
-
-            self.question_label.config(text="{}. {}".format(self.index + 1, self.questions[self.index]))
-            total_impact = 0
-            total_impact = 3*(int(self.intensidad.get())) + 2*(int(self.extension.get()))
-            total_impact = int(self.impact.get())*total_impact
-            variable = self.index
-            self.levantamiento[variable] = total_impact
-
-            self.impact.set(0)
-            self.extension.set(0)  # reset value for next question
-            self.intensidad.set(0)  # reset value for next question
-
-            time.sleep(.2)  # delay between questions
-
-
-class EndScreen(Frame):
-    """
-    Displays expenses at game question from General questions.
-    """
-
-    def __init__(self, master, controller):
-        Frame.__init__(self, master)
-        self.controller = controller
-
-        global general_answers_list
-
-        # Create header label
-        ttk.Label(self, text="End Screen", font=('Verdana', 20),
-                  borderwidth=2, relief="ridge").pack(padx=10, pady=10)
-
-        self.question = "The evaluation is now finished. Click continue to write the file."
-
-        # Set up labels and listbox
-        self.question_label = Label(self, text="10. {}".format(self.question), font=('Verdana', 16))
-        self.question_label.pack(anchor='w', padx=20, pady=10)
-
-
-        enter_button = ttk.Button(self, text="Continue", command=self.nextQuestion)
-        enter_button.pack(ipady=5, pady=20)
-
-    def nextQuestion(self):
-        '''
-        end diologue
-        '''
-
+        # the button stays disabled until the write is done, so the
+        # survey is not written twice
+        self.enter_button.state(['disabled'])
         self.writeToFile()
-        finished_text = "You have reached the end of the survey.\n"
-        finishedDialog("Finished Survey", finished_text)
 
     def writeToFile(self):
         """
-        When user selects finished button, writes each filename with corresponding 
-        answer list to separate files.
+        When user selects finished button, append the completed
+        survey to the results file and the binary log, and to the
+        SQLite database if the Survey was given one, on the
+        background writer.
         """
-        # list of names and answer lists
-        filenames = ['answers.csv']
-
-        answers_lists = [actions_impacts]
-
-        for filename, answers in zip(filenames, answers_lists):
-            writeToFile(filename, answers)
+        self.controller.saveSession(self.written)
 
+    def written(self, error):
+        """
+        Report the survey as finished once it is on disk, or let the
+        user try again if it could not be written.
+        """
+        self.enter_button.state(['!disabled'])
+        survey_id = self.controller.session.record.survey_id
+        if error is not None:
+            self.controller.events.error("survey_not_saved", survey=survey_id, error=str(error))
+            self.controller.dialogs.dialogBox("Not Saved", "The survey could not be written:\n{}".format(error))
+            return
+        self.controller.events.info("survey_saved", survey=survey_id)
+        self.controller.journal.finish()
+        finished_text = "You have reached the end of the survey.\n"
+        if self.controller.kiosk:
+            self.controller.dialogs.finishedDialog("Finished Survey", finished_text,
+                                                   "Next Respondent", self.controller.resetSession)
+        else:
+            self.controller.dialogs.finishedDialog("Finished Survey", finished_text)
+
+
+
+def main(argv=None):
+    """
+    Run the survey window, score a directory of results files with
+    'main.py score DIRECTORY', or serve the survey over HTTP with
+    'main.py serve' (and load test it with 'main.py loadtest'), or
+    time the dialogs and kiosk resets with 'main.py benchmark'.
+    """
+    parser = argparse.ArgumentParser(description="Environmental impact survey.")
+    parser.add_argument("--database", help="also store completed surveys in this SQLite database")
+    parser.add_argument("--transition-delay", type=int, default=200,
+                        help="delay in ms before the next question is shown, 0 to turn it off")
+    parser.add_argument("--event-log", help="append answer and section events to this JSON-lines file")
+    parser.add_argument("--log-level", choices=sorted(LEVELS, key=LEVELS.get), default="info",
+                        help="lowest level of events written to the event log")
+    parser.add_argument("--metrics", help="write latency histograms to this file at exit, "
+                                          "in the Prometheus format for .prom or .txt and as JSON otherwise")
+    parser.add_argument("--profile", default=os.environ.get("EIS_PROFILE"),
+                        help="write cProfile stats to this file and the top allocations to "
+                             "<file>.allocations.txt, and for score each worker's stats to <file>.<pid> "
+                             "(also set by the EIS_PROFILE environment variable)")
+    parser.add_argument("--profile-top", type=int, default=10, help="allocations listed per frame class")
+    parser.add_argument("--kiosk", action="store_true",
+                        help="start a new survey after each one instead of quitting")
+    subparsers = parser.add_subparsers(dest="command")
+    score_parser = subparsers.add_parser("score", help="score a directory of results files in parallel")
+    score_parser.add_argument("directory")
+    score_parser.add_argument("--pattern", default="*.csv", help="results file names to score")
+    score_parser.add_argument("--workers", type=int, default=None, help="worker processes, all cores by default")
+    score_parser.add_argument("--chunksize", type=int, default=1, help="files handed to a worker at a time")
+    serve_parser = subparsers.add_parser("serve", help="run the survey as an HTTP server for browsers")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--results", default="answers.csv", help="results file for completed surveys")
+    load_parser = subparsers.add_parser("loadtest", help="run concurrent respondents against a survey server")
+    load_parser.add_argument("--host", default="127.0.0.1")
+    load_parser.add_argument("--port", type=int, default=8080)
+    load_parser.add_argument("--sessions", type=int, default=300, help="concurrent respondents")
+    bench_parser = subparsers.add_parser("benchmark", help="time the dialog boxes and kiosk resets "
+                                                           "of a survey window")
+    bench_parser.add_argument("--dialogs", type=int, default=100, help="dialog boxes to open and close")
+    bench_parser.add_argument("--resets", type=int, default=100, help="kiosk surveys to answer and reset")
+    bench_parser.add_argument("--reset-budget", type=float, default=1000 * RESET_BUDGET,
+                              help="longest a reset may take in ms, exit with an error above it")
+    args = parser.parse_args(argv)
+
+    with profiled(args.profile, args.profile_top):
+        run(args)
+
+
+def run(args):
+    """
+    Run the command parsed by main.
+    """
+    if args.command == "score":
+        # NumPy is only needed for batch jobs, not for the survey window
+        from batch import scoreDirectory, printTotal
+        printTotal(scoreDirectory(args.directory, args.workers, args.pattern, args.chunksize, args.profile))
+    elif args.command == "serve":
+        from server import SurveyServer
+        try:
+            asyncio.run(SurveyServer(args.results).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "loadtest":
+        from server import loadTest
+        asyncio.run(loadTest(args.host, args.port, args.sessions))
+    elif args.command == "benchmark":
+        if args.dialogs:
+            benchmarkDialogs(args.dialogs)
+        if args.resets and not benchmarkReset(args.resets, args.reset_budget / 1000):
+            sys.exit("Kiosk reset over the {:.0f} ms budget".format(args.reset_budget))
+    else:
+        app = Survey(transition_delay=args.transition_delay, database=args.database, kiosk=args.kiosk,
+                     event_log=args.event_log, log_level=LEVELS[args.log_level], metrics_file=args.metrics)
+        app.mainloop()
 
 
 # Run program
 if __name__ == "__main__":
-    app = Survey()
-    app.mainloop()
+    main()
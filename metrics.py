@@ -0,0 +1,137 @@
+"""
+In-process latency histograms.
+
+A MetricsRegistry holds one Histogram per metric name and set of
+labels, with fixed buckets from 0.5 ms to 10 s, so recording a time is
+a bisect and two additions. The registry can be dumped as JSON or in
+the Prometheus text format, labelled with the station (host) name so
+dumps from several field stations can be compared.
+"""
+import bisect
+import json
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram(object):
+    """
+    Class that counts observed durations in seconds per bucket.
+    counts[i] is the number of observations <= BUCKETS[i] and above the
+    previous bucket, counts[-1] those above the last bucket.
+    """
+    __slots__ = ("counts", "count", "total", "low", "high")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.low = float("inf")
+        self.high = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.low = min(self.low, seconds)
+        self.high = max(self.high, seconds)
+
+    def quantile(self, q):
+        """
+        Return the upper bound of the bucket holding the q-quantile,
+        or inf if it is above the last bucket.
+        """
+        target = max(q * self.count, 1)
+        seen = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry(object):
+    """
+    Class that keeps the histograms of a process, see observe() and time().
+    """
+
+    def __init__(self, station=None):
+        self.station = station or socket.gethostname()
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def observe(self, name, seconds, **labels):
+        """
+        Add one duration in seconds to the histogram of name and labels.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, name, **labels):
+        """
+        Time the body of a with statement into the histogram of name and labels.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def tojson(self):
+        """
+        Return the registry as a JSON string, times in milliseconds.
+        """
+        metrics = []
+        with self.lock:
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                metrics.append({
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "sum_ms": 1000 * histogram.total,
+                    "min_ms": 1000 * histogram.low if histogram.count else None,
+                    "max_ms": 1000 * histogram.high,
+                    "p50_le_ms": 1000 * histogram.quantile(0.5) if histogram.count else None,
+                    "p99_le_ms": 1000 * histogram.quantile(0.99) if histogram.count else None,
+                    "buckets": dict(zip([str(bound) for bound in BUCKETS] + ["+Inf"], histogram.counts)),
+                })
+        return json.dumps({"station": self.station, "time": time.time(), "metrics": metrics}, indent=1)
+
+    def prometheus(self):
+        """
+        Return the registry in the Prometheus text exposition format.
+        """
+        lines = []
+        described = set()
+        with self.lock:
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in described:
+                    described.add(name)
+                    lines.append("# TYPE {} histogram".format(name))
+                labels = (("station", self.station),) + labels
+                text = ",".join('{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+                                for key, value in labels)
+                cumulative = 0
+                for bound, count in zip([repr(bound) for bound in BUCKETS] + ["+Inf"], histogram.counts):
+                    cumulative += count
+                    lines.append('{}_bucket{{{},le="{}"}} {}'.format(name, text, bound, cumulative))
+                lines.append("{}_sum{{{}}} {!r}".format(name, text, histogram.total))
+                lines.append("{}_count{{{}}} {}".format(name, text, histogram.count))
+        return "\n".join(lines) + "\n"
+
+    def dump(self, filename):
+        """
+        Write the registry to filename, in the Prometheus format if it
+        ends in .prom or .txt and as JSON otherwise.
+        """
+        text = self.prometheus() if filename.endswith((".prom", ".txt")) else self.tojson()
+        with open(filename, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(text)
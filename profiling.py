@@ -0,0 +1,99 @@
+"""
+Opt-in cProfile and tracemalloc hooks.
+
+profiled(filename) wraps the survey window or a batch job: it writes
+the cProfile stats to filename (open with pstats or snakeviz) and the
+top allocations to <filename>.allocations.txt, overall and for each
+frame class built while it ran. Without a filename it does nothing.
+
+Work done in pool worker processes is profiled with profiledCall,
+which writes one <filename>.<pid> per worker.
+"""
+import os
+import tracemalloc
+from contextlib import contextmanager
+
+# frame class name -> allocation differences of building it, see recordFrame
+frame_allocations = {}
+
+# profiler of this worker process, see profiledCall
+worker_profiler = None
+
+
+def frameSnapshot():
+    """
+    Return a tracemalloc snapshot to pass to recordFrame, or None when
+    not profiling.
+    """
+    if tracemalloc.is_tracing():
+        return tracemalloc.take_snapshot()
+    return None
+
+
+def recordFrame(name, before):
+    """
+    Keep what building the frame class name allocated since the
+    snapshot before from frameSnapshot.
+    """
+    if before is not None and tracemalloc.is_tracing():
+        frame_allocations[name] = tracemalloc.take_snapshot().compare_to(before, "lineno")
+
+
+def writeAllocations(filename, snapshot, top):
+    """
+    Write the top allocations of snapshot and of every recorded frame class.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    with open(filename, "w", encoding="utf-8") as report:
+        report.write("Traced memory: {:.1f} KiB, peak {:.1f} KiB\n\n".format(current / 1024, peak / 1024))
+        report.write("Top {} allocations at exit\n".format(top))
+        for statistic in snapshot.statistics("lineno")[:top]:
+            report.write("  {}\n".format(statistic))
+        for name, differences in sorted(frame_allocations.items()):
+            report.write("\nTop {} allocations building {}\n".format(top, name))
+            for difference in differences[:top]:
+                report.write("  {}\n".format(difference))
+
+
+def profiledCall(filename, function, *args):
+    """
+    Return function(*args), run under a cProfile kept for this process.
+    The stats of every call so far are written to <filename>.<pid>, so
+    each pool worker leaves one file (load them together with pstats).
+    """
+    global worker_profiler
+    import cProfile
+
+    if worker_profiler is None:
+        worker_profiler = cProfile.Profile()
+    worker_profiler.enable()
+    try:
+        return function(*args)
+    finally:
+        worker_profiler.disable()
+        worker_profiler.dump_stats("{}.{}".format(filename, os.getpid()))
+
+
+@contextmanager
+def profiled(filename=None, top=10):
+    """
+    Profile the body of a with statement into filename and
+    <filename>.allocations.txt, keeping the top allocations.
+    """
+    if filename is None:
+        yield
+        return
+    import cProfile
+
+    frame_allocations.clear()
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(filename)
+        writeAllocations(filename + ".allocations.txt", tracemalloc.take_snapshot(), top)
+        tracemalloc.stop()
+        print("Profile written to {} and {}.allocations.txt".format(filename, filename))
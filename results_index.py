@@ -0,0 +1,187 @@
+"""
+Byte-offset index over results CSV files.
+
+<name>.idx sits next to the results file. It holds a 16 byte header
+(magic and how many bytes of the results file it covers) followed by
+one 16 byte (survey_id, offset) entry per results row, so the row
+number of a survey is its entry number. ResultsWriter appends to it
+on every flush, and any rows it does not cover yet (for example when
+the index is new or a writer died between the two writes) are found by
+scanning only the uncovered tail of the results file.
+"""
+import mmap
+import os
+import struct
+
+MAGIC = b"EISIDX1\0"
+INDEX_HEADER = struct.Struct("<8sQ")
+ENTRY = struct.Struct("<QQ")
+
+
+def indexName(filename):
+    return filename + ".idx"
+
+
+def iterRows(fd, start, stop):
+    """
+    Yield (offset, line) for the results rows in bytes [start, stop) of
+    the open results file fd, skipping header lines. The file is read
+    through fd because closing any other descriptor of it would drop
+    our fcntl lock.
+    """
+    offset = start
+    rest = b""
+    os.lseek(fd, start, os.SEEK_SET)
+    while offset + len(rest) < stop:
+        block = os.read(fd, min(1 << 20, stop - offset - len(rest)))
+        if not block:
+            break
+        lines = (rest + block).split(b"\n")
+        rest = lines.pop()
+        for line in lines:
+            if line.split(b",", 1)[0].isdigit():  # not the header line
+                yield offset, line
+            offset += len(line) + 1
+
+
+def scanRows(fd, start, stop):
+    """
+    Return (survey_id, offset) for the results rows in bytes [start, stop) of fd.
+    """
+    return [(int(line.split(b",", 1)[0]), offset) for offset, line in iterRows(fd, start, stop)]
+
+
+def entryOffset(fd, number):
+    """
+    Return the results file offset held by index entry number.
+    """
+    os.lseek(fd, INDEX_HEADER.size + number * ENTRY.size, os.SEEK_SET)
+    return ENTRY.unpack(os.read(fd, ENTRY.size))[1]
+
+
+def firstEntryAfter(fd, count, covered):
+    """
+    Return the number of the first of count index entries whose row
+    starts at or after covered, or count if there is none.
+    """
+    if count == 0 or entryOffset(fd, count - 1) < covered:
+        return count  # the usual case, one read
+    low, high = 0, count - 1
+    while low < high:
+        middle = (low + high) // 2
+        if entryOffset(fd, middle) < covered:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def updateIndex(filename, data_fd, size, new_size=None, entries=()):
+    """
+    Bring the index of filename up to date. size is the size of the
+    results file before the rows in entries, a list of (survey_id, offset),
+    were appended, and new_size its size after them. data_fd is the
+    results file descriptor locked by results_writer.openLocked.
+    """
+    if new_size is None:
+        new_size = size
+    fd = os.open(indexName(filename), os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        header = os.read(fd, INDEX_HEADER.size)
+        covered = 0
+        if len(header) == INDEX_HEADER.size:
+            magic, covered = INDEX_HEADER.unpack(header)
+            if magic != MAGIC or covered > size:
+                covered = 0  # not our index, or the results file was replaced
+        if covered == 0:
+            os.ftruncate(fd, INDEX_HEADER.size)
+        else:
+            # drop an entry cut short by a crash, and entries for rows past
+            # covered, appended by a writer that died before updating the
+            # header; those rows are scanned again below
+            count = (os.fstat(fd).st_size - INDEX_HEADER.size) // ENTRY.size
+            os.ftruncate(fd, INDEX_HEADER.size + firstEntryAfter(fd, count, covered) * ENTRY.size)
+
+        if covered < size:
+            entries = scanRows(data_fd, covered, size) + list(entries)
+        if entries:
+            os.lseek(fd, 0, os.SEEK_END)
+            os.write(fd, b"".join(ENTRY.pack(survey_id, offset) for survey_id, offset in entries))
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, INDEX_HEADER.pack(MAGIC, new_size))
+    finally:
+        os.close(fd)
+
+
+class ResultsIndex(object):
+    """
+    Class that maps the index of a results file for random access.
+    Lookup by row number takes constant time; lookup by survey id is
+    a binary search over a sorted copy of the ids made once, on first use.
+    """
+
+    def __init__(self, filename):
+        # NumPy is only needed to read the index, not to write it
+        import numpy as np
+
+        self.filename = filename
+        dtype = np.dtype([("survey_id", "<u8"), ("offset", "<u8")])
+        with open(indexName(filename), "rb") as index_file:
+            size = os.fstat(index_file.fileno()).st_size
+            if size > INDEX_HEADER.size:
+                data = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+                count = (size - INDEX_HEADER.size) // ENTRY.size
+                self.entries = np.frombuffer(data, dtype=dtype, count=count, offset=INDEX_HEADER.size)
+            else:
+                self.entries = np.empty(0, dtype=dtype)
+        self.order = None
+        self.ids = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def offset(self, row):
+        """
+        Return the byte offset of results row number row (from 0).
+        """
+        return int(self.entries["offset"][row])
+
+    def findSurvey(self, survey_id):
+        """
+        Return the row number of survey_id, or None if it is not indexed.
+        """
+        import numpy as np
+
+        if self.order is None:
+            self.order = np.argsort(self.entries["survey_id"], kind="stable")
+            self.ids = self.entries["survey_id"][self.order]
+        ids = self.ids
+        position = int(np.searchsorted(ids, np.uint64(survey_id)))
+        if position < len(ids) and ids[position] == survey_id:
+            return int(self.order[position])
+        return None
+
+    def readRow(self, row):
+        """
+        Return results row number row as a list of strings.
+        """
+        import csv
+
+        with open(self.filename, "rb") as csvfile:
+            csvfile.seek(self.offset(row))
+            line = csvfile.readline().decode("utf-8")
+        return next(csv.reader([line]))
+
+
+def buildIndex(filename):
+    """
+    Build or repair the index of an existing results file.
+    """
+    from results_writer import openLocked, unlockFile  # results_writer imports this module
+
+    fd = openLocked(filename)
+    try:
+        updateIndex(filename, fd, os.fstat(fd).st_size)
+    finally:
+        unlockFile(fd)
+        os.close(fd)
@@ -0,0 +1,56 @@
+"""
+Streaming reader for results CSV files written by ResultsWriter.
+
+Rows are parsed a chunk at a time into fixed-size NumPy arrays, so
+memory use does not grow with the size of the file.
+"""
+import csv
+
+import numpy as np
+
+from survey_core import ACTIONS, questions
+from results_writer import HEADER
+
+SCORES = slice(4, 4 + len(ACTIONS) * len(questions))
+TRIPLETS = slice(SCORES.stop, len(HEADER))
+
+
+def readChunks(filename, chunk_size=4096, skipped=None):
+    """
+    Read a results file chunk_size surveys at a time.
+    Yields (scores, triplets) arrays with shapes (n, 13, 3) and
+    (n, 13, 3, 3), where n is chunk_size except for the last chunk.
+
+    Header lines are passed over. Any other row that is not a results
+    row, such as the class-name rows and Q1..Q13 header written by the
+    old writeToFile or a row cut short, is skipped without stopping;
+    if skipped is a list, the line number of each one is appended to it.
+    """
+    shape = (len(ACTIONS), len(questions))
+    scores = np.empty((chunk_size,) + shape, dtype=np.int16)
+    triplets = np.empty((chunk_size,) + shape + (3,), dtype=np.int8)
+    count = 0
+
+    with open(filename, newline='', encoding="utf-8", errors="replace") as csvfile:
+        reader = csv.reader(csvfile)
+        for row in reader:
+            if row == HEADER:
+                continue
+            try:
+                if len(row) != len(HEADER):
+                    raise ValueError("expected {} columns".format(len(HEADER)))
+                scores[count] = np.reshape([int(value) for value in row[SCORES]], shape)
+                triplets[count] = np.reshape([int(value) for value in row[TRIPLETS]], shape + (3,))
+            except ValueError:
+                if skipped is not None:
+                    skipped.append(reader.line_num)
+                continue
+            count += 1
+            if count == chunk_size:
+                yield scores, triplets
+                scores = np.empty_like(scores)
+                triplets = np.empty_like(triplets)
+                count = 0
+
+    if count:
+        yield scores[:count], triplets[:count]
@@ -0,0 +1,338 @@
+"""
+Buffered CSV writer for completed surveys.
+
+Each completed survey is written as one row with stable column names:
+the survey metadata, one score column per action x component and the
+raw (impact, intensidad, extension) behind every score.
+"""
+import csv
+import io
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from survey_core import ACTIONS, questions
+from results_index import indexName, updateIndex
+
+TRIPLET_FIELDS = ("impact", "intensidad", "extension")
+
+HEADER = (["survey_id", "site", "started", "finished"]
+          + ["{}_{}".format(action, question) for action, title in ACTIONS for question in questions]
+          + ["{}_{}_{}".format(action, question, field)
+             for action, title in ACTIONS for question in questions for field in TRIPLET_FIELDS])
+HEADER_LINE = (",".join(HEADER) + "\n").encode("utf-8")
+TRIPLET_COLUMNS = slice(len(HEADER) - len(TRIPLET_FIELDS) * len(ACTIONS) * len(questions), len(HEADER))
+
+# file locks are held per process, this keeps threads of one process apart
+process_lock = threading.Lock()
+
+
+def formatTime(timestamp):
+    """
+    Format a time.time() value for the results file.
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(timestamp))
+
+
+def recordRow(record, finished):
+    """
+    Return the results row for a SessionRecord finished at time finished.
+    """
+    triplets = [value for action in record.triplets.tolist() for triplet in action for value in triplet]
+    return ([record.survey_id, record.site, formatTime(record.started), formatTime(finished)]
+            + record.tolist() + triplets)
+
+
+class ResultsWriter(object):
+    """
+    Class that appends completed surveys to a results CSV file.
+    Rows are buffered and written batch_size at a time, call flush()
+    or close() (or use the writer as a context manager) to write the rest.
+
+    Every row is also added to the byte-offset index next to the file
+    (see results_index), so any survey can be read back without a scan,
+    and to the per-cell aggregates and quantiles next to it when NumPy
+    is installed (see aggregates.updateSidecar).
+
+    Several writers, in one or more processes or on several machines
+    sharing a folder, can append to the same file: every batch is
+    written with one write while holding an exclusive lock on the file.
+    The header is written under the same lock when the file is empty,
+    so it appears exactly once. Only the first line of an existing file
+    is read, to check that it holds the same columns; a file from the
+    old writeToFile is moved aside to <name>.legacy.csv (see legacyName)
+    and a new file is started.
+
+    With sync=True every flush is fsynced before the lock is released,
+    so the rows are on disk once flush() returns. If the fsync fails the
+    rows are already in the file, so unsynced is set and syncFile()
+    makes them durable without writing them again.
+    """
+
+    def __init__(self, filename, batch_size=64, sync=False):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.sync = sync
+        self.unsynced = False
+        self.rows = []
+        # offsets of rows found in the file that are not results rows,
+        # left out of the aggregates
+        self.skipped = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, record, finished=None):
+        """
+        Buffer one completed SessionRecord, flushing when the batch is full.
+        """
+        if finished is None:
+            finished = time.time()
+        self.rows.append(recordRow(record, finished))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Append the buffered rows to the file with one write, holding
+        the file lock so rows from several writers never interleave
+        (a row cut short by a crash at the end of the file is dropped first),
+        and add them to the index (see results_index).
+        The rows are dropped from the buffer as soon as they are in the
+        file, so a flush that fails later on (updating the index or the
+        aggregates, which are repaired by the next flush) never writes
+        them twice.
+        """
+        if not self.rows:
+            return
+        text = io.StringIO()
+        writer = csv.writer(text, delimiter=',', lineterminator='\n')
+        lines = []
+        for row in self.rows:
+            writer.writerow(row)
+            lines.append(text.getvalue().encode("utf-8"))
+            text.seek(0)
+            text.truncate()
+
+        with process_lock:
+            fd = openLocked(self.filename)
+            try:
+                size = os.fstat(fd).st_size
+                complete = lastLineEnd(fd, size)
+                if complete != size:
+                    # drop a row cut short by a crash, it would be glued to ours
+                    os.ftruncate(fd, complete)
+                    size = complete
+                offset = size
+                if size == 0:
+                    lines.insert(0, HEADER_LINE)  # new file, write a header
+                    offset = len(HEADER_LINE)
+                entries = []
+                for row, line in zip(self.rows, lines[len(lines) - len(self.rows):]):
+                    entries.append((row[0], offset))
+                    offset += len(line)
+                data = b"".join(lines)
+                if os.write(fd, data) != len(data):
+                    os.ftruncate(fd, size)  # disk full, do not leave part of a row
+                    raise OSError("short write to {}".format(self.filename))
+                rows, self.rows = self.rows, []
+                if self.sync:
+                    self.unsynced = True
+                    os.fsync(fd)
+                    self.unsynced = False
+                updateIndex(self.filename, fd, size, offset, entries)
+                aggregates = loadAggregates()
+                if aggregates is not None:
+                    aggregates.updateSidecar(self.filename, fd, size, offset,
+                                             [row[TRIPLET_COLUMNS] for row in rows], skipped=self.skipped)
+            finally:
+                unlockFile(fd)
+                os.close(fd)
+
+    def syncFile(self):
+        """
+        Flush a file whose fsync failed to disk again, see unsynced.
+        """
+        fd = os.open(self.filename, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.unsynced = False
+
+    def discard(self):
+        """
+        Drop the rows not written yet, returning True if there were any.
+        """
+        dropped = bool(self.rows)
+        self.rows = []
+        return dropped
+
+    def close(self):
+        self.flush()
+
+
+def loadAggregates():
+    """
+    Return the aggregates module, or None when NumPy is not installed
+    and the .agg sidecar is not kept. It is imported on first use so
+    the survey window does not load NumPy at startup.
+    """
+    try:
+        import aggregates
+    except ImportError:
+        return None
+    return aggregates
+
+
+def openLocked(filename):
+    """
+    Open filename for appending and lock it. An existing file that does
+    not start with HEADER is moved aside (see legacyName) and a new file
+    is opened. Only the first line of the file is ever read.
+    Returns the locked file descriptor.
+    """
+    while True:
+        fd = os.open(filename, os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        lockFile(fd)
+        try:
+            # another writer may have moved the file aside while we waited
+            if os.path.samestat(os.fstat(fd), os.stat(filename)):
+                os.lseek(fd, 0, os.SEEK_SET)
+                first_line = os.read(fd, len(HEADER_LINE))
+                if not first_line or first_line == HEADER_LINE:
+                    return fd
+                os.replace(filename, legacyName(filename))
+        except FileNotFoundError:
+            pass
+        unlockFile(fd)
+        os.close(fd)
+
+
+def lastLineEnd(fd, size):
+    """
+    Return the offset just after the last newline in the first size
+    bytes of fd, or 0 if there is none.
+    """
+    end = size
+    while end > 0:
+        start = max(0, end - 4096)
+        os.lseek(fd, start, os.SEEK_SET)
+        block = os.read(fd, end - start)
+        position = block.rfind(b"\n")
+        if position >= 0:
+            return start + position + 1
+        end = start
+    return 0
+
+
+def lockFile(fd):
+    """
+    Block until we hold the exclusive lock on fd.
+    """
+    if fcntl is not None:
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+    else:
+        # lock the first byte as a mutex, LK_LOCK gives up after 10 seconds
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                pass
+
+
+def unlockFile(fd):
+    if fcntl is not None:
+        fcntl.lockf(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def legacyName(filename):
+    """
+    Return an unused name for a results file with an old header,
+    answers.csv becomes answers.legacy.csv, answers.legacy-2.csv, ...
+    """
+    root, ext = os.path.splitext(filename)
+    name = "{}.legacy{}".format(root, ext)
+    count = 1
+    while os.path.exists(name):
+        count += 1
+        name = "{}.legacy-{}{}".format(root, count, ext)
+    return name
+
+
+def writeSurveys(filename, count, batch_size):
+    """
+    Write count random surveys to filename, used by stressTest.
+    """
+    import random
+    from survey_core import SessionRecord, scoreAnswer
+
+    with ResultsWriter(filename, batch_size) as writer:
+        for i in range(count):
+            record = SessionRecord(site="stress-{}".format(os.getpid()))
+            scores, triplets = record.scores, record.triplets
+            for action in range(len(ACTIONS)):
+                for component in range(len(questions)):
+                    impact = random.choice((-1, 0, 1))
+                    intensidad, extension = random.choice((1, 2, 4, 8, 12)), random.choice((1, 2, 4, 8, 12))
+                    scores[action, component] = scoreAnswer(impact, intensidad, extension)
+                    triplets[action, component, 0] = impact
+                    triplets[action, component, 1] = intensidad
+                    triplets[action, component, 2] = extension
+            writer.write(record)
+
+
+def stressTest(filename, writers=8, surveys=2000, batch_size=16):
+    """
+    Append surveys from several processes at once to a new file, then
+    check that it holds one header and only whole rows, and print the
+    throughput.
+    """
+    from multiprocessing import Process
+
+    for name in (filename, indexName(filename), filename + ".agg"):
+        if os.path.exists(name):
+            os.remove(name)
+    processes = [Process(target=writeSurveys, args=(filename, surveys, batch_size)) for i in range(writers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    with open(filename, newline='', encoding="utf-8") as csvfile:
+        rows = list(csv.reader(csvfile))
+    headers = sum(1 for row in rows if row == HEADER)
+    broken = sum(1 for row in rows if len(row) != len(HEADER))
+    surveys_written = len(rows) - headers
+    print("{} writers, {} surveys in {:.2f}s ({:.0f} surveys/s), {} header(s), {} broken rows".format(
+        writers, surveys_written, elapsed, surveys_written / elapsed, headers, broken))
+    if headers != 1 or broken or surveys_written != writers * surveys:
+        raise AssertionError("results file {} is corrupt".format(filename))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stress test several processes appending to one results file.")
+    parser.add_argument("filename", nargs="?", default="stress_answers.csv")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--surveys", type=int, default=2000, help="surveys per writer")
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+    stressTest(args.filename, args.writers, args.surveys, args.batch_size)
@@ -0,0 +1,69 @@
+"""
+Vectorized scoring of many surveys at once with NumPy.
+
+Uses the same rule as survey_core.scoreAnswer, applied to whole
+arrays of answer codes instead of one answer at a time.
+"""
+import numpy as np
+
+from survey_core import ACTIONS, questions, WEIGHTS, SessionRecord
+
+# NumPy layout of a SessionRecord, so a run of records can be read
+# with np.frombuffer without unpacking them one by one
+RECORD_DTYPE = np.dtype([
+    ("survey_id", "<u8"),
+    ("started", "<f8"),
+    ("site", "S16"),
+    ("scores", "=i2", (len(ACTIONS), len(questions))),
+    ("triplets", "i1", (len(ACTIONS), len(questions), 3)),
+])
+assert RECORD_DTYPE.itemsize == SessionRecord.SIZE
+
+
+def scoreBatch(impact, intensidad, extension, weights=WEIGHTS):
+    """
+    Score N surveys at once.
+    Parameters: impact, intensidad, extension: array-likes of answer codes
+                with shape (N, 13, 3), one row per survey, one column per
+                action in ACTIONS and one entry per component in questions.
+                weights: weights of (intensidad, extension).
+    Returns (scores, action_totals, component_totals) with shapes
+    (N, 13, 3), (N, 13) and (N, 3).
+    """
+    shape = (len(ACTIONS), len(questions))
+    impact = np.asarray(impact, dtype=np.int32)
+    intensidad = np.asarray(intensidad, dtype=np.int32)
+    extension = np.asarray(extension, dtype=np.int32)
+    for codes in (impact, intensidad, extension):
+        if codes.shape[1:] != shape:
+            raise ValueError("expected answer codes with shape (N, {}, {}), got {}".format(
+                shape[0], shape[1], codes.shape))
+
+    # impact 0 gives a score of 0 whatever intensidad and extension hold
+    scores = impact * (weights[0] * intensidad + weights[1] * extension)
+    return scores, scores.sum(axis=2), scores.sum(axis=1)
+
+
+def rescoreBatch(triplets, weights=WEIGHTS):
+    """
+    Score N surveys from their raw answers.
+    Parameters: triplets: array-like with shape (N, 13, 3, 3) holding
+                (impact, intensidad, extension) for every score.
+                weights: weights of (intensidad, extension).
+    Returns the same (scores, action_totals, component_totals) as scoreBatch.
+    """
+    triplets = np.asarray(triplets)
+    return scoreBatch(triplets[..., 0], triplets[..., 1], triplets[..., 2], weights)
+
+
+def rescoreArchive(filename, weights=WEIGHTS):
+    """
+    Rescore every survey in a binary log written by binary_log.BinaryLogWriter
+    (such as answers.bin) with new weights.
+    The log is mapped and its raw answers viewed in place, only the
+    scores are newly allocated.
+    Returns the same (scores, action_totals, component_totals) as scoreBatch.
+    """
+    from binary_log import readBinaryLog  # binary_log imports this module lazily
+
+    return rescoreBatch(readBinaryLog(filename)["triplets"], weights)
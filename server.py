@@ -0,0 +1,331 @@
+"""
+Asyncio HTTP server that runs the survey for browsers on field tablets.
+
+Serves the same actions, components and validation rules as the Tk
+window from one process, keeping a SurveySession per respondent.
+Completed surveys are handed to a ResultsWriter in batches on a
+writer thread, so disk I/O never blocks the event loop.
+
+    GET  /                         page that runs the survey in the browser
+    POST /sessions                 start a survey, body {"site": ...} is optional
+    GET  /sessions/<id>            current question
+    POST /sessions/<id>/answer     body {"impact", "intensidad", "extension"}
+"""
+import asyncio
+import json
+import random
+import secrets
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from survey_core import ACTIONS, questions, IMPACT_SCALE, RATING_SCALE, SurveySession
+from results_writer import ResultsWriter
+
+MAX_BODY = 4096
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Environmental Impact Survey</title>
+<style>body{font-family:Verdana,sans-serif;text-align:center}fieldset{border:2px ridge;margin:10px auto;width:32em}</style>
+</head><body>
+<h2 id="title">Environmental Impact</h2><h3 id="question"></h3><p id="error" style="color:#b00"></p>
+<form id="form">%(fieldsets)s<button>Next Question</button></form>
+<script>
+let session = null;
+function show(state) {
+  if (state.finished) { document.body.innerHTML = "<h2>You have reached the end of the survey.</h2>"; return; }
+  document.getElementById("title").textContent = state.title;
+  document.getElementById("question").textContent = state.question + ". " + state.component;
+  document.getElementById("form").reset();
+}
+async function call(path, body) {
+  const response = await fetch(path, {method: "POST", body: JSON.stringify(body || {})});
+  return [response.ok, await response.json()];
+}
+call("/sessions").then(([ok, state]) => { session = state.session; show(state); });
+document.getElementById("form").onsubmit = async (event) => {
+  event.preventDefault();
+  const form = new FormData(event.target), answer = {};
+  for (const name of ["impact", "intensidad", "extension"]) answer[name] = Number(form.get(name) || 0);
+  const [ok, state] = await call("/sessions/" + session + "/answer", answer);
+  document.getElementById("error").textContent = ok ? "" : state.error + ": " + state.message;
+  if (ok) show(state);
+};
+</script></body></html>
+"""
+
+
+def scaleFieldset(name, scale):
+    """
+    Return the radio buttons of one answer scale as an HTML fieldset.
+    """
+    buttons = "".join('<label><input type="radio" name="{}" value="{}"{}> {}</label> '.format(
+        name.lower(), value, " checked" if value == 0 else "", text) for text, value in scale)
+    return "<fieldset><legend>{}</legend>{}</fieldset>".format(name, buttons)
+
+
+def questionState(session_id, session):
+    """
+    Return the JSON state of the current question of a session.
+    """
+    if session.finished:
+        return {"session": session_id, "finished": True}
+    return {
+        "session": session_id,
+        "finished": False,
+        "action": ACTIONS[session.action_index][0],
+        "title": ACTIONS[session.action_index][1],
+        "part": session.action_index + 1,
+        "question": session.index + 1,
+        "component": questions[session.index],
+    }
+
+
+class SurveyServer(object):
+    """
+    Class that serves surveys over HTTP and writes completed ones to
+    results_file, batch_size at a time or every flush_interval seconds.
+    Sessions without a request for idle_timeout seconds are dropped.
+    """
+
+    def __init__(self, results_file="answers.csv", batch_size=64, flush_interval=1.0, idle_timeout=3600.0):
+        # session id -> SurveySession, least recently used first
+        self.sessions = OrderedDict()
+        self.last_seen = {}
+        self.idle_timeout = idle_timeout
+        self.completed = []
+        self.flush_lock = asyncio.Lock()
+        # rows are only written by flush() in writeBatch, one write per batch
+        self.results = ResultsWriter(results_file, sys.maxsize)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # one thread, so the ResultsWriter is only ever used by one thread
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.page = (PAGE % {"fieldsets": scaleFieldset("Impact", IMPACT_SCALE)
+                             + scaleFieldset("Intensidad", RATING_SCALE)
+                             + scaleFieldset("Extension", RATING_SCALE)}).encode("utf-8")
+
+    async def serve(self, host="0.0.0.0", port=8080):
+        """
+        Serve until cancelled, then write out any remaining surveys.
+        """
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        flusher = asyncio.ensure_future(self.flushPeriodically())
+        print("Serving surveys on http://{}:{}/".format(host, port))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            flusher.cancel()
+            await self.flush()
+            self.executor.shutdown()
+
+    async def flushPeriodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.expireSessions()
+            try:
+                await self.flush()
+            except Exception as error:  # keep serving, the batch is retried next time
+                print("Writing {} surveys failed, will retry: {!r}".format(len(self.completed), error))
+
+    def expireSessions(self):
+        """
+        Drop the sessions idle for longer than idle_timeout.
+        """
+        deadline = time.monotonic() - self.idle_timeout
+        while self.sessions:
+            session_id = next(iter(self.sessions))
+            if self.last_seen[session_id] > deadline:
+                break
+            del self.sessions[session_id]
+            del self.last_seen[session_id]
+
+    async def flush(self):
+        """
+        Hand the completed surveys to the writer thread. They are only
+        removed from self.completed once written, so a batch that fails
+        is written by a later flush.
+        """
+        async with self.flush_lock:
+            if not self.completed:
+                return
+            batch = list(self.completed)
+            await asyncio.get_running_loop().run_in_executor(self.executor, self.writeBatch, batch)
+            del self.completed[:len(batch)]
+
+    def writeBatch(self, batch):
+        for record, finished in batch:
+            self.results.write(record, finished)
+        try:
+            self.results.flush()
+        except Exception as error:
+            if self.results.discard():
+                raise  # nothing was written, the batch stays in self.completed
+            # the rows are in the file, the index and aggregates catch up next flush
+            print("Surveys written but their index was not updated: {!r}".format(error))
+
+    async def handle(self, reader, writer):
+        """
+        Serve the requests of one keep-alive connection.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    writer.write(self.response(413, {"error": "Request body too large"}, False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = self.route(method, path, body)
+                except Exception as error:  # answer the request rather than drop the connection
+                    print("Error handling {} {}: {!r}".format(method, path, error))
+                    status, payload = 500, {"error": "Internal error"}
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(self.response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+                if len(self.completed) >= self.batch_size and not self.flush_lock.locked():
+                    try:
+                        await self.flush()
+                    except Exception as error:
+                        print("Writing {} surveys failed, will retry: {!r}".format(len(self.completed), error))
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def response(self, status, payload, keep_alive):
+        """
+        Return an HTTP response for a JSON payload, or for the page if payload is bytes.
+        """
+        if isinstance(payload, bytes):
+            content_type, body = "text/html; charset=utf-8", payload
+        else:
+            content_type, body = "application/json", json.dumps(payload).encode("utf-8")
+        return ("HTTP/1.1 {} {}\r\nContent-Type: {}\r\nContent-Length: {}\r\nConnection: {}\r\n\r\n".format(
+            status, REASONS[status], content_type, len(body), "keep-alive" if keep_alive else "close",
+        ).encode("latin-1") + body)
+
+    def route(self, method, path, body):
+        """
+        Handle one request and return (status, payload).
+        """
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if parts == [""]:
+            return (200, self.page) if method == "GET" else (405, {"error": "Use GET"})
+        if parts[0] != "sessions" or len(parts) > 3:
+            return 404, {"error": "Not found"}
+        try:
+            data = json.loads(body or b"{}")
+            if not isinstance(data, dict):
+                raise ValueError
+        except ValueError:
+            return 400, {"error": "Body must be a JSON object"}
+
+        if len(parts) == 1:
+            if method != "POST":
+                return 405, {"error": "Use POST"}
+            session_id = secrets.token_hex(8)
+            self.sessions[session_id] = SurveySession(site=str(data.get("site", "")))
+            self.last_seen[session_id] = time.monotonic()
+            return 201, questionState(session_id, self.sessions[session_id])
+
+        session = self.sessions.get(parts[1])
+        if session is None:
+            return 404, {"error": "No such session"}
+        self.sessions.move_to_end(parts[1])
+        self.last_seen[parts[1]] = time.monotonic()
+        if len(parts) == 2:
+            return (200, questionState(parts[1], session)) if method == "GET" else (405, {"error": "Use GET"})
+        if parts[2] != "answer" or method != "POST":
+            return 404, {"error": "Not found"}
+
+        answer = [data.get(name, 0) for name in ("impact", "intensidad", "extension")]
+        # only JSON integers: no floats, strings or booleans (bool is an int subclass)
+        if any(type(value) is not int for value in answer):
+            return 400, {"error": "Answers must be integers"}
+        error = session.answer(*answer)
+        if error is not None:
+            return 400, {"error": error[0], "message": error[1]}
+        if session.finished:
+            del self.sessions[parts[1]]
+            del self.last_seen[parts[1]]
+            self.completed.append((session.record, time.time()))
+        return 200, questionState(parts[1], session)
+
+
+async def request(reader, writer, method, path, payload=None):
+    """
+    Send one keep-alive request and return (status, JSON payload).
+    """
+    body = json.dumps(payload or {}).encode("utf-8")
+    writer.write("{} {} HTTP/1.1\r\nHost: survey\r\nContent-Length: {}\r\n\r\n".format(
+        method, path, len(body)).encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def respondent(host, port, latencies):
+    """
+    Answer one whole survey with random answers over one connection.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        start = time.perf_counter()
+        status, state = await request(reader, writer, "POST", "/sessions", {"site": "loadtest"})
+        latencies.append(time.perf_counter() - start)
+        while not state["finished"]:
+            impact = random.choice((-1, 0, 1))
+            answer = {"impact": impact,
+                      "intensidad": random.choice((1, 2, 4, 8, 12)) if impact else 0,
+                      "extension": random.choice((1, 2, 4, 8, 12)) if impact else 0}
+            start = time.perf_counter()
+            status, state = await request(reader, writer, "POST", "/sessions/{}/answer".format(state["session"]),
+                                          answer)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError("answer refused: {}".format(state))
+    finally:
+        writer.close()
+
+
+async def loadTest(host="127.0.0.1", port=8080, sessions=300):
+    """
+    Run sessions concurrent respondents against a server and print the
+    throughput and request latency.
+    """
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(respondent(host, port, latencies) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print("{} concurrent surveys in {:.2f}s ({:.0f} surveys/s, {:.0f} requests/s), "
+          "latency p50 {:.1f} ms, p99 {:.1f} ms".format(
+              sessions, elapsed, sessions / elapsed, len(latencies) / elapsed,
+              1000 * latencies[len(latencies) // 2], 1000 * latencies[int(len(latencies) * 0.99)]))
@@ -0,0 +1,99 @@
+"""
+Optional SQLite storage for completed surveys.
+
+Holds one row per (survey, action, component) with the raw answer and
+its score, so reports can query by site, date or action on indexes
+instead of scanning the results CSV.
+"""
+import sqlite3
+import time
+
+from survey_core import ACTIONS, questions
+from results_writer import formatTime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    survey_id INTEGER NOT NULL,
+    site TEXT NOT NULL,
+    started TEXT NOT NULL,
+    finished TEXT NOT NULL,
+    action TEXT NOT NULL,
+    component TEXT NOT NULL,
+    impact INTEGER NOT NULL,
+    intensidad INTEGER NOT NULL,
+    extension INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (survey_id, action, component)
+);
+CREATE INDEX IF NOT EXISTS answers_site ON answers (site, finished);
+CREATE INDEX IF NOT EXISTS answers_finished ON answers (finished);
+CREATE INDEX IF NOT EXISTS answers_action ON answers (action, component);
+"""
+
+
+class SQLiteStore(object):
+    """
+    Class that stores completed surveys in a SQLite database in WAL mode.
+    Surveys are buffered and inserted batch_size at a time in one
+    transaction, call flush() or close() (or use the store as a context
+    manager) to insert the rest. With sync=True every transaction is
+    on disk once it commits, not only once the WAL is checkpointed.
+    """
+
+    def __init__(self, filename, batch_size=64, sync=False):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.rows = []
+        self.surveys = 0
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous={}".format("FULL" if sync else "NORMAL"))
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, record, finished=None):
+        """
+        Buffer one completed SessionRecord, inserting when the batch is full.
+        """
+        if finished is None:
+            finished = time.time()
+        survey = (record.survey_id, record.site, formatTime(record.started), formatTime(finished))
+        scores = record.scores.tolist()
+        for action_index, answers in enumerate(record.triplets.tolist()):
+            action = ACTIONS[action_index][0]
+            for component, triplet in enumerate(answers):
+                self.rows.append(survey + (action, questions[component]) + tuple(triplet)
+                                 + (scores[action_index][component],))
+        self.surveys += 1
+        if self.surveys >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Insert the buffered surveys in one transaction.
+        """
+        if not self.rows:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self.rows)
+        self.rows = []
+        self.surveys = 0
+
+    def discard(self):
+        """
+        Drop the surveys not inserted yet, returning True if there were any.
+        """
+        dropped = self.surveys > 0
+        self.rows = []
+        self.surveys = 0
+        return dropped
+
+    def close(self):
+        self.flush()
+        self.connection.close()
@@ -0,0 +1,208 @@
+"""
+Survey model, validation and scoring for the environmental impact survey.
+
+This module does not import tkinter, so the same rules can be used
+by the Tk front-end in main.py and by batch jobs without a display.
+"""
+import struct
+import time
+import uuid
+
+# create empty lists used for each set of questions
+questions = ["Abiotico", "Biotico", "Socioeconomico"]
+
+# actions in the plan, in survey order: (name, header text)
+ACTIONS = [
+    ("Construccion", "Construccion campamento y oficinas"),
+    ("Apertura", "Apertura y perforación bocaminas"),
+    ("Adecuacion", "Adecuacion del sistema de acceso y sostenimiento"),
+    ("Descapote", "Descapote y remotion capa vegetal"),
+    ("Vias_transporte", "Adecuacion de vias de transporte"),
+    ("Disposicion", "Disposicion escombros y material removido"),
+    ("Arranque", "Arranque y extracción"),
+    ("Cargue", "Cargue y transporte"),
+    ("Ventilacion", "Ventilacion"),
+    ("Drenajes", "Drenajes y manejo de aguas"),
+    ("Esteriles_escombros", "Disposicion de estériles y escombros"),
+    ("Cierre", "Cierre de bocaminas"),
+    ("Levantamiento", "Levantamiento infraestructura"),
+]
+
+# answer scales: (text, value), 0 means no answer was selected
+IMPACT_SCALE = [("Negative", -1), ("No Impact", 0), ("Positive", 1)]
+RATING_SCALE = [("Baja", 1), ("Media", 2), ("Alta", 4), ("Muy Alta", 8), ("Total", 12)]
+
+# codes an answer may hold, 0 is also allowed for an unselected rating
+IMPACT_VALUES = frozenset(value for text, value in IMPACT_SCALE)
+RATING_VALUES = frozenset([0] + [value for text, value in RATING_SCALE])
+
+# weights of (intensidad, extension) in the total impact
+WEIGHTS = (3, 2)
+
+
+def validateAnswer(impact, intensidad, extension):
+    """
+    Check one answer, values may be ints or the strings held by the GUI.
+    Returns None if the answer is valid, otherwise (title, message)
+    for the dialog box that explains what is missing or not on its scale.
+    """
+    for name, value, values in (("Impact", impact, IMPACT_VALUES), ("Intensidad", intensidad, RATING_VALUES),
+                                ("Extension", extension, RATING_VALUES)):
+        if int(value) not in values:
+            return ("Invalid Value: {}".format(name),
+                    "{} is not on the {} scale.\nPlease try again.".format(value, name))
+    if int(impact) != 0 and int(intensidad) == 0:
+        return ("No Value Given: Intensidad",
+                "You did not select an answer.\nPlease try again.")
+    if int(impact) != 0 and int(extension) == 0:
+        return ("No Value Given: Extension",
+                "You did not select an answer.\nPlease try again.")
+    return None
+
+
+def cleanSite(site):
+    """
+    Return site without newlines or other control characters, which
+    would split a results row over several lines.
+    """
+    return "".join(character for character in site if character.isprintable())
+
+
+def scoreAnswer(impact, intensidad, extension, weights=WEIGHTS):
+    """
+    Return the total impact of one answer: impact*(3*intensidad + 2*extension)
+    with the default weights.
+    """
+    return int(impact) * (weights[0] * int(intensidad) + weights[1] * int(extension))
+
+
+class SessionRecord(object):
+    """
+    Compact record of one survey: a fixed header (63-bit survey id, start
+    time, site) followed by a 13x3 int16 matrix of scores, one row per action
+    in ACTIONS and one column per component in questions, and a 13x3x3
+    int8 block with the raw (impact, intensidad, extension) of each score.
+
+    Everything lives in one buffer, so a record is turned into bytes
+    with .buffer and rebuilt with SessionRecord(data) without copying.
+    The matrix uses native byte order.
+    """
+    __slots__ = ("buffer",)
+
+    HEADER = struct.Struct("<Qd16s")
+    SCORES_SIZE = 2 * len(ACTIONS) * len(questions)
+    SIZE = HEADER.size + SCORES_SIZE + 3 * len(ACTIONS) * len(questions)
+
+    def __init__(self, buffer=None, site=""):
+        if buffer is None:
+            buffer = bytearray(self.SIZE)
+            self.HEADER.pack_into(buffer, 0, uuid.uuid4().int >> 65, time.time(),
+                                  cleanSite(site).encode("utf-8")[:16])
+        buffer = memoryview(buffer).cast("B")
+        if buffer.nbytes != self.SIZE:
+            raise ValueError("expected {} bytes for a SessionRecord, got {}".format(
+                self.SIZE, buffer.nbytes))
+        self.buffer = buffer
+
+    def __reduce__(self):
+        return SessionRecord, (bytes(self.buffer),)
+
+    @property
+    def survey_id(self):
+        return self.HEADER.unpack_from(self.buffer)[0]
+
+    @property
+    def started(self):
+        return self.HEADER.unpack_from(self.buffer)[1]
+
+    @property
+    def site(self):
+        # cleaned again for records read back from older journals and logs
+        return cleanSite(self.HEADER.unpack_from(self.buffer)[2].rstrip(b"\0").decode("utf-8", "replace"))
+
+    @property
+    def scores(self):
+        """
+        Writable (13, 3) view of the scores, indexed as scores[action, component].
+        """
+        start = self.HEADER.size
+        return self.buffer[start:start + self.SCORES_SIZE].cast("h", (len(ACTIONS), len(questions)))
+
+    @property
+    def triplets(self):
+        """
+        Writable (13, 3, 3) view of the raw answers, indexed as
+        triplets[action, component, i] with i = 0, 1, 2 for
+        impact, intensidad and extension.
+        """
+        start = self.HEADER.size + self.SCORES_SIZE
+        return self.buffer[start:].cast("b", (len(ACTIONS), len(questions), 3))
+
+    def store(self, action_index, index, impact, intensidad, extension):
+        """
+        Score an answer to question index of the action at action_index
+        and store the score and the raw answer. Returns the total impact.
+        """
+        total_impact = scoreAnswer(impact, intensidad, extension)
+        self.scores[action_index, index] = total_impact
+        triplets = self.triplets
+        triplets[action_index, index, 0] = int(impact)
+        triplets[action_index, index, 1] = int(intensidad)
+        triplets[action_index, index, 2] = int(extension)
+        return total_impact
+
+    def rescore(self, weights=WEIGHTS):
+        """
+        Recompute every score from the raw answers with new weights.
+        """
+        scores = self.scores
+        for action, answers in enumerate(self.triplets.tolist()):
+            for component, triplet in enumerate(answers):
+                scores[action, component] = scoreAnswer(*triplet, weights=weights)
+
+    def actionScores(self, action_index):
+        """
+        Return the scores of one action as a list.
+        """
+        return self.scores.tolist()[action_index]
+
+    def tolist(self):
+        """
+        Return all scores as a flat list, action by action.
+        """
+        return [score for action in self.scores.tolist() for score in action]
+
+
+class SurveySession(object):
+    """
+    One survey being answered: its SessionRecord and the position of
+    the next question, action_index in ACTIONS and index in questions.
+    """
+    __slots__ = ("record", "action_index", "index")
+
+    def __init__(self, record=None, action_index=0, index=0, site=""):
+        self.record = SessionRecord(site=site) if record is None else record
+        self.action_index = action_index
+        self.index = index
+
+    @property
+    def finished(self):
+        return self.action_index == len(ACTIONS)
+
+    def answer(self, impact, intensidad, extension):
+        """
+        Validate and store the answer to the current question, then move
+        on to the next one. Returns None, or (title, message) from
+        validateAnswer if the answer was refused.
+        """
+        if self.finished:
+            return ("Survey Finished", "Every question has been answered.")
+        error = validateAnswer(impact, intensidad, extension)
+        if error is not None:
+            return error
+        self.record.store(self.action_index, self.index, impact, intensidad, extension)
+        self.index += 1
+        if self.index == len(questions):
+            self.action_index += 1
+            self.index = 0
+        return None
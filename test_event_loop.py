@@ -0,0 +1,270 @@
+"""
+Timing tests: answering a whole survey never blocks the Tk event loop
+for longer than BUDGET.
+
+HeadlessEventLoopTest runs ActionFrame's methods against a fake
+controller and a virtual-time after() loop, so it needs no display.
+EventLoopTest runs the real window and is skipped without a display
+(run it under xvfb-run).
+"""
+import heapq
+import os
+import tempfile
+import time
+import unittest
+from tkinter import Tk, TclError
+
+import main
+from event_log import EventLog
+from metrics import MetricsRegistry
+from survey_core import ACTIONS, questions, SurveySession
+
+# longest time the event loop may go without running a callback
+BUDGET = 0.1
+TRANSITION_DELAY = 50
+HEARTBEAT = 5
+
+
+def displayAvailable():
+    try:
+        root = Tk()
+    except TclError:
+        return False
+    root.destroy()
+    return True
+
+
+class FakeLoop(object):
+    """
+    after() scheduler running callbacks in virtual time, recording the
+    real time each callback takes.
+    """
+
+    def __init__(self):
+        self.now = 0
+        self.calls = []
+        self.count = 0
+        self.durations = []
+
+    def after(self, delay, callback, *args):
+        self.count += 1
+        heapq.heappush(self.calls, (self.now + delay, self.count, callback, args))
+
+    def run(self, done, limit=100000):
+        while self.calls and not done() and limit:
+            due, count, callback, args = heapq.heappop(self.calls)
+            self.now = max(self.now, due)
+            start = time.perf_counter()
+            callback(*args)
+            self.durations.append(time.perf_counter() - start)
+            limit -= 1
+
+
+class FakeVariable(object):
+    def __init__(self):
+        self.value = 0
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class FakeWidget(object):
+    def __init__(self):
+        self.disabled = False
+
+    def config(self, **options):
+        pass
+
+    def state(self, states):
+        self.disabled = states == ["disabled"]
+
+    def instate(self, states):
+        return not self.disabled
+
+
+class FakeDialogs(object):
+    def __init__(self, loop):
+        self.loop = loop
+        self.errors = []
+
+    def dialogBox(self, title, message):
+        self.errors.append(title)
+
+    def nextSurveyDialog(self, title, message, cmd):
+        self.loop.after(HEARTBEAT, cmd)  # "Begin" is clicked
+
+
+class FakeController(object):
+    def __init__(self, loop, transition_delay):
+        self.session = SurveySession()
+        self.transition_delay = transition_delay
+        self.dialogs = FakeDialogs(loop)
+        self.events = EventLog()
+        self.metrics = MetricsRegistry()
+        self.journal = self
+        self.shown = []
+
+    def append(self, *answer):
+        pass
+
+    def show_frame(self, cont):
+        self.shown.append(cont)
+
+
+class FakeActionFrame(object):
+    """
+    Stands in for the ActionFrame widget, running its real methods.
+    """
+    showQuestion = main.ActionFrame.showQuestion
+    nextQuestion = main.ActionFrame.nextQuestion
+    nextAction = main.ActionFrame.nextAction
+
+    def __init__(self, controller, loop):
+        self.controller = controller
+        self.after = loop.after
+        self.questions = questions
+        self.header_label = FakeWidget()
+        self.question_label = FakeWidget()
+        self.enter_button = FakeWidget()
+        self.impact = FakeVariable()
+        self.intensidad = FakeVariable()
+        self.extension = FakeVariable()
+        self.showQuestion()
+
+
+class HeadlessEventLoopTest(unittest.TestCase):
+
+    def runSurvey(self, transition_delay):
+        """
+        Answer every question from after() callbacks while a heartbeat
+        runs; returns (loop, controller, heartbeat times).
+        """
+        loop = FakeLoop()
+        controller = FakeController(loop, transition_delay)
+        frame = FakeActionFrame(controller, loop)
+        beats = []
+
+        def heartbeat():
+            beats.append(loop.now)
+            loop.after(HEARTBEAT, heartbeat)
+
+        def step():
+            if frame.enter_button.instate(["!disabled"]) and not controller.session.finished:
+                frame.impact.set(1)
+                frame.intensidad.set(1)
+                frame.extension.set(1)
+                frame.nextQuestion()
+            loop.after(HEARTBEAT, step)
+
+        loop.after(0, heartbeat)
+        loop.after(0, step)
+        sleep = time.sleep
+        time.sleep = self.fail  # nothing may sleep on the event loop
+        try:
+            loop.run(lambda: main.EndScreen in controller.shown)
+        finally:
+            time.sleep = sleep
+        return loop, controller, beats
+
+    def checkRun(self, transition_delay):
+        loop, controller, beats = self.runSurvey(transition_delay)
+        self.assertEqual(controller.shown, [main.EndScreen])
+        self.assertEqual(controller.session.record.tolist(), [5] * (len(ACTIONS) * len(questions)))
+        self.assertEqual(controller.dialogs.errors, [])
+        self.assertLess(max(loop.durations), BUDGET,
+                        "a callback blocked for {:.0f} ms".format(1000 * max(loop.durations)))
+        # the heartbeat kept running all through the survey, delays included
+        gaps = [later - earlier for earlier, later in zip(beats, beats[1:])]
+        self.assertLessEqual(max(gaps), HEARTBEAT)
+        return loop
+
+    def testTransitionDelay(self):
+        loop = self.checkRun(TRANSITION_DELAY)
+        transitions = len(ACTIONS) * (len(questions) - 1)
+        self.assertGreaterEqual(loop.now, transitions * TRANSITION_DELAY)
+
+    def testNoTransitionDelay(self):
+        self.checkRun(0)
+
+
+@unittest.skipUnless(displayAvailable(), "needs a display")
+class EventLoopTest(unittest.TestCase):
+
+    def setUp(self):
+        # the Survey writes its journal and results to the working directory
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def runSurvey(self, transition_delay):
+        """
+        Answer every question through ActionFrame.nextQuestion from after()
+        callbacks while a heartbeat records the gaps between callbacks.
+        Returns (app, gaps, elapsed seconds).
+        """
+        Survey, ActionFrame, EndScreen = main.Survey, main.ActionFrame, main.EndScreen
+
+        app = Survey(transition_delay=transition_delay, journal="test.journal")
+        gaps = []
+        last = [time.perf_counter()]
+
+        def heartbeat():
+            now = time.perf_counter()
+            gaps.append(now - last[0])
+            last[0] = now
+            app.after(HEARTBEAT, heartbeat)
+
+        def step():
+            next_dialog = app.dialogs.windows.get("next")
+            if next_dialog is not None and next_dialog[0].state() == "normal":
+                next_dialog[2].invoke()  # "Begin" the next action
+            elif app.session.finished:
+                if EndScreen in app.frames:
+                    app.quit()
+                    return
+            else:
+                frame = app.frames[ActionFrame]
+                if frame.enter_button.instate(["!disabled"]):
+                    frame.impact.set(1)
+                    frame.intensidad.set(1)
+                    frame.extension.set(1)
+                    frame.nextQuestion()
+            app.after(HEARTBEAT, step)
+
+        app.show_frame(ActionFrame)
+        app.after(HEARTBEAT, heartbeat)
+        app.after(HEARTBEAT, step)
+        app.after(60000, app.quit)  # never hang the test run
+        start = time.perf_counter()
+        app.mainloop()
+        return app, gaps, time.perf_counter() - start
+
+    def checkRun(self, transition_delay):
+        app, gaps, elapsed = self.runSurvey(transition_delay)
+        try:
+            self.assertTrue(app.session.finished)
+            self.assertEqual(app.session.record.tolist(), [5] * (len(ACTIONS) * len(questions)))
+            self.assertLess(max(gaps), BUDGET, "event loop blocked for {:.0f} ms".format(1000 * max(gaps)))
+        finally:
+            app.destroy()
+        return elapsed
+
+    def testTransitionDelay(self):
+        elapsed = self.checkRun(TRANSITION_DELAY)
+        # the delay happens between questions inside actions, on the event loop
+        transitions = len(ACTIONS) * (len(questions) - 1)
+        self.assertGreaterEqual(elapsed, transitions * TRANSITION_DELAY / 1000.0)
+
+    def testNoTransitionDelay(self):
+        self.checkRun(0)
+
+
+if __name__ == "__main__":
+    unittest.main()